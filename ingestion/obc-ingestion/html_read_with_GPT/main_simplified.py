@@ -21,6 +21,9 @@ from stage1_html_extraction import HTMLExtractor
 from ingestion.shared.src.core.graph_manager import GraphManager
 from ingestion.shared.src.core.embeddings import EmbeddingManager
 from ingestion.shared.config.sources import ELAWS_OBC_HTML_URL
+from neo4j_batches import (
+    HIERARCHY_QUERY, SECTION_QUERY, CLAUSE_QUERY, SUBCLAUSE_QUERY, with_parent_ids, write_batched
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,7 +33,6 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-
 class SimplifiedIngestPipeline:
     """2-stage pipeline: Extract → Ingest"""
 
@@ -188,166 +190,64 @@ class SimplifiedIngestPipeline:
         }
 
         try:
-            # Create regulation and hierarchy
-            reg_query = """
-            CREATE (r:Regulation {
-                regulation_id: '332/12',
-                title: 'Building Code',
-                abbreviation: 'O. Reg. 332/12',
-                source_url: 'https://www.ontario.ca/laws/regulation/120332'
-            })
-            RETURN id(r) as neo4j_id
-            """
-            reg_result = graph.execute_query(reg_query, {})
-            reg_id = reg_result[0]["neo4j_id"] if reg_result else None
-            stats["nodes_created"] += 1
-
-            # Create Division and Part (simplified)
-            div_query = """
-            CREATE (d:Division {division_id: 'A', title: 'Compliance and Objectives'})
-            RETURN id(d) as neo4j_id
-            """
-            div_result = graph.execute_query(div_query, {})
-            div_id = div_result[0]["neo4j_id"] if div_result else None
-            stats["nodes_created"] += 1
-
-            # Link division to regulation
-            if reg_id and div_id:
-                graph.execute_query(
-                    "MATCH (r) WHERE id(r) = $reg_id MATCH (d) WHERE id(d) = $div_id CREATE (r)-[:HAS_DIVISION]->(d)",
-                    {"reg_id": reg_id, "div_id": div_id}
-                )
-                stats["relationships_created"] += 1
-
-            part_query = """
-            CREATE (p:Part {part_number: '3', title: 'Fire Protection, Occupant Safety and Accessibility'})
-            RETURN id(p) as neo4j_id
-            """
-            part_result = graph.execute_query(part_query, {})
-            part_id = part_result[0]["neo4j_id"] if part_result else None
-            stats["nodes_created"] += 1
-
-            # Link part to division
-            if div_id and part_id:
-                graph.execute_query(
-                    "MATCH (d) WHERE id(d) = $div_id MATCH (p) WHERE id(p) = $part_id CREATE (d)-[:HAS_PART]->(p)",
-                    {"div_id": div_id, "part_id": part_id}
-                )
-                stats["relationships_created"] += 1
-
-            # Process sections and clauses
+            # Create the regulation, Division A and Part 3 in one statement
+            hierarchy_result = graph.execute_query(HIERARCHY_QUERY, {})
+            part_id = hierarchy_result[0]["part_id"] if hierarchy_result else None
+            stats["nodes_created"] += 3
+            stats["relationships_created"] += 2
+
+            # Buffer one row per section, clause and subclause, then write each
+            # level with UNWIND batches (parents first, so their ids are known)
             sections = extraction.get("sections", [])
             logger.info(f"Processing {len(sections)} sections")
 
+            section_rows = []
+            clause_rows = []
+            item_rows = []
+            # Full texts are embedded; the nodes store the first 1000 characters
+            clause_texts = []
+            item_texts = []
             for section_idx, section in enumerate(sections):
-                try:
-                    section_number = section.get("section_number", "")
-                    section_title = section.get("title", "")
-                    clauses = section.get("extracted_clauses", [])
-
-                    # Create section node
-                    section_query = """
-                    CREATE (s:Section {
-                        section_number: $number,
-                        title: $title
+                section_key = f"section:{section_idx}"
+                section_rows.append({
+                    "key": section_key,
+                    "number": section.get("section_number", ""),
+                    "title": section.get("title", ""),
+                })
+
+                for clause in section.get("extracted_clauses", []):
+                    clause_key = f"clause:{len(clause_rows)}"
+                    clause_texts.append(clause.get("text") or "")
+                    clause_rows.append({
+                        "key": clause_key,
+                        "parent_key": section_key,
+                        "number": clause.get("number", ""),
+                        "text": clause_texts[-1][:1000],
                     })
-                    RETURN id(s) as neo4j_id
-                    """
-                    section_result = graph.execute_query(section_query, {
-                        "number": section_number,
-                        "title": section_title
-                    })
-                    section_id = section_result[0]["neo4j_id"] if section_result else None
-
-                    if section_id:
-                        stats["nodes_created"] += 1
-
-                        # Link section to part
-                        if part_id:
-                            graph.execute_query(
-                                "MATCH (p) WHERE id(p) = $part_id MATCH (s) WHERE id(s) = $section_id CREATE (p)-[:HAS_SECTION]->(s)",
-                                {"part_id": part_id, "section_id": section_id}
-                            )
-                            stats["relationships_created"] += 1
-
-                        # Create clause nodes
-                        for clause_idx, clause in enumerate(clauses):
-                            try:
-                                clause_number = clause.get("number", "")
-                                clause_text = clause.get("text", "")
-
-                                # Generate embedding
-                                embedding = em.embed_text(clause_text)
-
-                                # Create clause node
-                                clause_query = """
-                                CREATE (c:Clause {
-                                    clause_number: $number,
-                                    text: $text,
-                                    embedding: $embedding
-                                })
-                                RETURN id(c) as neo4j_id
-                                """
-                                clause_result = graph.execute_query(clause_query, {
-                                    "number": clause_number,
-                                    "text": clause_text[:1000],
-                                    "embedding": embedding
-                                })
-                                clause_id = clause_result[0]["neo4j_id"] if clause_result else None
-
-                                if clause_id:
-                                    stats["nodes_created"] += 1
-                                    stats["clauses_ingested"] += 1
-
-                                    # Link clause to section
-                                    graph.execute_query(
-                                        "MATCH (s) WHERE id(s) = $section_id MATCH (c) WHERE id(c) = $clause_id CREATE (s)-[:HAS_CLAUSE]->(c)",
-                                        {"section_id": section_id, "clause_id": clause_id}
-                                    )
-                                    stats["relationships_created"] += 1
-
-                                    # Create nested items (subclauses)
-                                    nested_items = clause.get("nested_items", [])
-                                    for item in nested_items:
-                                        item_number = item.get("number", "")
-                                        item_text = item.get("text", "")
-
-                                        item_embedding = em.embed_text(item_text)
-
-                                        item_query = """
-                                        CREATE (i:SubClause {
-                                            number: $number,
-                                            text: $text,
-                                            embedding: $embedding
-                                        })
-                                        RETURN id(i) as neo4j_id
-                                        """
-                                        item_result = graph.execute_query(item_query, {
-                                            "number": item_number,
-                                            "text": item_text[:1000],
-                                            "embedding": item_embedding
-                                        })
-                                        item_id = item_result[0]["neo4j_id"] if item_result else None
-
-                                        if item_id:
-                                            stats["nodes_created"] += 1
-
-                                            # Link to parent clause
-                                            graph.execute_query(
-                                                "MATCH (c) WHERE id(c) = $clause_id MATCH (i) WHERE id(i) = $item_id CREATE (c)-[:HAS_SUBCLAUSE]->(i)",
-                                                {"clause_id": clause_id, "item_id": item_id}
-                                            )
-                                            stats["relationships_created"] += 1
-
-                            except Exception as e:
-                                logger.warning(f"Error creating clause {clause_idx}: {e}")
-                                stats["errors"].append(str(e))
-                                continue
-
-                except Exception as e:
-                    logger.warning(f"Error processing section {section_idx}: {e}")
-                    stats["errors"].append(str(e))
-                    continue
+
+                    for item in clause.get("nested_items", []):
+                        item_texts.append(item.get("text") or "")
+                        item_rows.append({
+                            "key": f"item:{len(item_rows)}",
+                            "parent_key": clause_key,
+                            "number": item.get("number", ""),
+                            "text": item_texts[-1][:1000],
+                        })
+
+            # A failing batch is recorded in stats["errors"] and skipped, so the
+            # counts below cover only the rows that were written
+            errors = stats["errors"]
+            section_ids = write_batched(graph, SECTION_QUERY, section_rows, params={"part_id": part_id}, errors=errors)
+            clause_ids = write_batched(
+                graph, CLAUSE_QUERY, with_parent_ids(clause_rows, section_ids), em=em, texts=clause_texts, errors=errors
+            )
+            item_ids = write_batched(
+                graph, SUBCLAUSE_QUERY, with_parent_ids(item_rows, clause_ids), em=em, texts=item_texts, errors=errors
+            )
+
+            stats["nodes_created"] += len(section_ids) + len(clause_ids) + len(item_ids)
+            stats["relationships_created"] += (len(section_ids) if part_id is not None else 0) + len(clause_ids) + len(item_ids)
+            stats["clauses_ingested"] += len(clause_ids)
 
             logger.info(f"Ingestion complete: {stats['nodes_created']} nodes, {stats['clauses_ingested']} clauses")
 
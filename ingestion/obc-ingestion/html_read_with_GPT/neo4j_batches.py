@@ -0,0 +1,131 @@
+"""
+Batched Neo4j writes shared by the HTML ingestion pipelines
+
+Nodes are buffered as rows and written with one UNWIND query per
+BATCH_SIZE rows. Each query returns the node id for each row's key, so
+children can be linked to their parents by id.
+"""
+
+import logging
+import time
+from typing import Dict, Any, List, Optional
+
+from ingestion.shared.src.core.graph_manager import GraphManager
+from ingestion.shared.src.core.embeddings import EmbeddingManager
+
+logger = logging.getLogger(__name__)
+
+# Rows sent per UNWIND query
+BATCH_SIZE = 1000
+
+HIERARCHY_QUERY = """
+CREATE (r:Regulation {
+    regulation_id: '332/12',
+    title: 'Building Code',
+    abbreviation: 'O. Reg. 332/12',
+    source_url: 'https://www.ontario.ca/laws/regulation/120332'
+})-[:HAS_DIVISION]->(d:Division {division_id: 'A', title: 'Compliance and Objectives'})
+-[:HAS_PART]->(p:Part {
+    part_number: '3',
+    title: 'Fire Protection, Occupant Safety and Accessibility'
+})
+RETURN id(p) AS part_id
+"""
+
+SECTION_QUERY = """
+UNWIND $rows AS row
+CREATE (s:Section {section_number: row.number, title: row.title})
+WITH s, row
+OPTIONAL MATCH (p) WHERE id(p) = $part_id
+FOREACH (_ IN CASE WHEN p IS NULL THEN [] ELSE [1] END |
+    CREATE (p)-[:HAS_SECTION]->(s))
+RETURN row.key AS key, id(s) AS neo4j_id
+"""
+
+CLAUSE_QUERY = """
+UNWIND $rows AS row
+MATCH (s) WHERE id(s) = row.parent_id
+CREATE (s)-[:HAS_CLAUSE]->(c:Clause {
+    clause_number: row.number,
+    text: row.text,
+    embedding: row.embedding
+})
+RETURN row.key AS key, id(c) AS neo4j_id
+"""
+
+SUBCLAUSE_QUERY = """
+UNWIND $rows AS row
+MATCH (c) WHERE id(c) = row.parent_id
+CREATE (c)-[:HAS_SUBCLAUSE]->(i:SubClause {
+    number: row.number,
+    text: row.text,
+    embedding: row.embedding
+})
+RETURN row.key AS key, id(i) AS neo4j_id
+"""
+
+
+def with_parent_ids(rows: List[Dict[str, Any]], parent_ids: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Swap each row's parent_key for the neo4j_id its parent was written with"""
+    return [
+        {**{k: v for k, v in row.items() if k != "parent_key"}, "parent_id": parent_ids.get(row["parent_key"])}
+        for row in rows
+    ]
+
+
+def write_batched(
+    graph: GraphManager,
+    query: str,
+    rows: List[Dict[str, Any]],
+    params: Optional[Dict[str, Any]] = None,
+    em: Optional[EmbeddingManager] = None,
+    texts: Optional[List[str]] = None,
+    timings: Optional[Dict[str, float]] = None,
+    errors: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run an UNWIND query over rows in chunks of BATCH_SIZE.
+
+    Args:
+        graph: GraphManager to run the query with
+        query: UNWIND query over $rows returning key and neo4j_id
+        rows: One parameter map per node
+        params: Extra query parameters shared by every batch
+        em: EmbeddingManager used when texts are given
+        texts: Text to embed for each row; each chunk's texts are embedded
+            in one batch call and attached to the rows as "embedding"
+        timings: Accumulates seconds spent in "embeddings" and "writes"
+        errors: When given, a failing batch is logged, recorded here and
+            skipped; otherwise the exception propagates
+
+    Returns:
+        Mapping of row key to the neo4j_id returned by the query
+    """
+    node_ids = {}
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        try:
+            if texts is not None:
+                t0 = time.perf_counter()
+                embeddings = em.embed_batch(texts[start:start + BATCH_SIZE])
+                if timings is not None:
+                    timings["embeddings"] += time.perf_counter() - t0
+                batch = [{**row, "embedding": embedding} for row, embedding in zip(batch, embeddings)]
+
+            t0 = time.perf_counter()
+            result = graph.execute_query(query, {"rows": batch, **(params or {})})
+            if timings is not None:
+                timings["writes"] += time.perf_counter() - t0
+
+        except Exception as e:
+            if errors is None:
+                raise
+            logger.warning(f"Error writing rows {start}-{start + len(batch) - 1}: {e}")
+            errors.append(str(e))
+            continue
+
+        for record in result:
+            node_ids[record["key"]] = record["neo4j_id"]
+
+    return node_ids
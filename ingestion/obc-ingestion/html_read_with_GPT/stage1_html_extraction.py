@@ -8,13 +8,13 @@ No unnecessary stages. Just pure extraction.
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 import json
 import re
 from pathlib import Path
 import sys
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from openai import OpenAI
 import hashlib
 
@@ -22,6 +22,20 @@ sys.path.insert(0, str(Path(__file__).parents[3]))
 
 logger = logging.getLogger(__name__)
 
+# Tags _extract_sections_from_html walks; everything else is skipped at parse time
+HEADING_LEVELS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+BODY_TAGS = frozenset({'p', 'div'})
+CONTENT_TAGS = [*HEADING_LEVELS, *BODY_TAGS]
+
+# Structural patterns run on every section, compiled once
+_CLAUSE_RE = re.compile(r'\((\d+)\)\s*([^(\n]+?)(?=\(\d+\)|$)', re.DOTALL)  # (1), (2), (3)
+_SUBCLAUSE_RE = re.compile(r'\(([a-z])\)\s*([^(]+?)(?=\([a-z]\)|$)', re.DOTALL)  # (a), (b), (c)
+_DEFINITION_RE = re.compile(r'["\']([^"\']+)["\']\s+(?:means|is defined as|refers to)\s+([^.]+\.)')
+_REFERENCE_RE = re.compile(
+    r'(?:section|part|subsection|clause|table)\s+(\d+(?:\.\d+)*(?:\.\d+)?)', re.IGNORECASE
+)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 
 class HTMLExtractor:
     """Extract structure and clauses from HTML documents"""
@@ -53,21 +67,24 @@ class HTMLExtractor:
         response = requests.get(url, timeout=30)
         response.raise_for_status()
 
-        return self.extract_from_html(response.text)
+        # Raw bytes: lxml decodes them in C, using the page's declared charset
+        return self.extract_from_html(response.content)
 
-    def extract_from_html(self, html_content: str) -> Dict[str, Any]:
+    def extract_from_html(self, html_content: Union[str, bytes]) -> Dict[str, Any]:
         """
         Extract structured content from HTML string.
 
         Args:
-            html_content: HTML string to process
+            html_content: HTML to process, as a string or undecoded bytes
 
         Returns:
             Structured extraction
         """
         logger.info("Parsing HTML with BeautifulSoup")
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(
+            html_content, 'lxml', parse_only=SoupStrainer(CONTENT_TAGS)
+        )
 
         # Remove script and style elements
         for script in soup(["script", "style"]):
@@ -120,9 +137,11 @@ class HTMLExtractor:
         current_hierarchy = {}
         current_section_content = []
 
-        for element in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div']):
+        for element in soup.find_all(CONTENT_TAGS):
+            level = HEADING_LEVELS.get(element.name)
+
             # Handle header elements
-            if element.name.startswith('h'):
+            if level is not None:
                 # Save previous section if exists
                 if current_section_content:
                     section_text = '\n'.join(current_section_content)
@@ -140,7 +159,6 @@ class HTMLExtractor:
                     current_section_content = []
 
                 # Update hierarchy
-                level = int(element.name[1])
                 text = element.get_text().strip()
                 current_hierarchy[level] = text
 
@@ -150,7 +168,7 @@ class HTMLExtractor:
                         del current_hierarchy[i]
 
             # Handle content elements
-            elif element.name in ['p', 'div']:
+            elif element.name in BODY_TAGS:
                 text = element.get_text().strip()
                 if text and len(text) > 10:  # Skip tiny content
                     current_section_content.append(text)
@@ -186,9 +204,8 @@ class HTMLExtractor:
         definitions = []
         references = []
 
-        # Pattern for numbered clauses: (1), (2), (3)
-        clause_pattern = r'\((\d+)\)\s*([^(\n]+?)(?=\(\d+\)|$)'
-        for match in re.finditer(clause_pattern, text, re.DOTALL):
+        # Numbered clauses: (1), (2), (3)
+        for match in _CLAUSE_RE.finditer(text):
             clause_num = match.group(1)
             clause_text = match.group(2).strip()
 
@@ -201,8 +218,7 @@ class HTMLExtractor:
                 }
 
                 # Try to find subclauses: (a), (b), (c)
-                subclause_pattern = r'\(([a-z])\)\s*([^(]+?)(?=\([a-z]\)|$)'
-                for sub_match in re.finditer(subclause_pattern, clause_text, re.DOTALL):
+                for sub_match in _SUBCLAUSE_RE.finditer(clause_text):
                     sub_num = sub_match.group(1)
                     sub_text = sub_match.group(2).strip()
 
@@ -216,8 +232,7 @@ class HTMLExtractor:
                 clauses.append(clause_obj)
 
         # Simple definition detection: "term" means / is defined as
-        definition_pattern = r'["\']([^"\']+)["\']\s+(?:means|is defined as|refers to)\s+([^.]+\.)'
-        for match in re.finditer(definition_pattern, text):
+        for match in _DEFINITION_RE.finditer(text):
             term = match.group(1)
             definition = match.group(2)
             if len(term) < 100:  # Valid term length
@@ -227,8 +242,7 @@ class HTMLExtractor:
                 })
 
         # Reference detection: section, part, etc.
-        reference_pattern = r'(?:section|part|subsection|clause|table)\s+(\d+(?:\.\d+)*(?:\.\d+)?)'
-        for match in re.finditer(reference_pattern, text, re.IGNORECASE):
+        for match in _REFERENCE_RE.finditer(text):
             ref = match.group(1)
             references.append({
                 "reference": ref,
@@ -299,7 +313,7 @@ TEXT:
 
             # Extract JSON
             import json as json_lib
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(response_text)
             if json_match:
                 parsed = json_lib.loads(json_match.group())
                 return {
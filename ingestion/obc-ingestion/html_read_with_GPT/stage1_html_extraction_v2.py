@@ -14,19 +14,33 @@ New approach:
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 import json
 import re
 from pathlib import Path
 import sys
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from openai import OpenAI
 
 sys.path.insert(0, str(Path(__file__).parents[3]))
 
 logger = logging.getLogger(__name__)
 
+# Patterns applied to every line or section, compiled once
+_SECTION_HEADING_RE = re.compile(r'^(\d+\.\d+(?:\.\d+)*)\s*[.:]?\s*(.+?)$')  # 3.2.2, 3.2.2.1, etc.
+_CLAUSE_SPLIT_RE = re.compile(r'(?=\(\d+\))')
+_CLAUSE_RE = re.compile(r'\((\d+)\)(.*)', re.DOTALL)
+_CLAUSE_MARKER_RE = re.compile(r'\(\d+\)')
+_SUBCLAUSE_SPLIT_RE = re.compile(r'(?=\([a-z]\))')
+_SUBCLAUSE_RE = re.compile(r'\(([a-z])\)(.*)', re.DOTALL)
+_SUBCLAUSE_MARKER_RE = re.compile(r'\([a-z]\)')
+_ROMAN_PATTERN = r'\(([iv]+)\)'  # (i), (ii), (iii), (iv), etc.
+_ROMAN_SPLIT_RE = re.compile(f'(?={_ROMAN_PATTERN})')
+_ROMAN_RE = re.compile(f'{_ROMAN_PATTERN}(.*)', re.DOTALL)
+_ROMAN_MARKER_RE = re.compile(_ROMAN_PATTERN)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 
 class HTMLExtractorV2:
     """Improved HTML extraction with better clause detection"""
@@ -42,12 +56,18 @@ class HTMLExtractorV2:
         logger.info(f"Fetching HTML from {url}")
         response = requests.get(url, timeout=30)
         response.raise_for_status()
-        return self.extract_from_html(response.text)
+        # Raw bytes: lxml decodes them in C, using the page's declared charset
+        return self.extract_from_html(response.content)
 
-    def extract_from_html(self, html_content: str) -> Dict[str, Any]:
-        """Extract all structure from HTML"""
+    def extract_from_html(self, html_content: Union[str, bytes]) -> Dict[str, Any]:
+        """Extract all structure from HTML, given as a string or undecoded bytes"""
         logger.info("Parsing HTML")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Only the body carries section text; skipping <head> saves building
+        # its tags. lxml implies a <body> for fragments, so the full parse is
+        # only a fallback for documents with nothing in it.
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=SoupStrainer('body'))
+        if not soup.contents:
+            soup = BeautifulSoup(html_content, 'lxml')
 
         # Remove scripts and styles
         for script in soup(["script", "style"]):
@@ -86,9 +106,6 @@ class HTMLExtractorV2:
         """Extract sections using section number patterns"""
         sections = []
 
-        # Pattern to find section numbers: 3.2.2, 3.2.2.1, etc.
-        section_pattern = r'^(\d+\.\d+(?:\.\d+)*)\s*[.:]?\s*(.+?)$'
-
         lines = text.split('\n')
         current_section = None
         current_content = []
@@ -98,8 +115,9 @@ class HTMLExtractorV2:
             if not line:
                 continue
 
-            # Check if this line starts a new section
-            match = re.match(section_pattern, line)
+            # Check if this line starts a new section; only lines starting
+            # with a digit can, so the rest skip the regex call
+            match = _SECTION_HEADING_RE.match(line) if line[0].isdigit() else None
             if match:
                 # Save previous section
                 if current_section:
@@ -139,7 +157,7 @@ class HTMLExtractorV2:
 
         # Split by main clause delimiters: (1), (2), (3), etc.
         # Use a positive lookahead to split but keep the delimiter
-        clause_splits = re.split(r'(?=\(\d+\))', text)
+        clause_splits = _CLAUSE_SPLIT_RE.split(text)
 
         for clause_text in clause_splits:
             clause_text = clause_text.strip()
@@ -147,7 +165,7 @@ class HTMLExtractorV2:
                 continue
 
             # Extract the clause number
-            clause_match = re.match(r'\((\d+)\)(.*)', clause_text, re.DOTALL)
+            clause_match = _CLAUSE_RE.match(clause_text)
             if not clause_match:
                 continue
 
@@ -155,7 +173,7 @@ class HTMLExtractorV2:
             clause_content = clause_match.group(2).strip()
 
             # Find where the next clause would start (if any)
-            next_clause_match = re.search(r'\(\d+\)', clause_content)
+            next_clause_match = _CLAUSE_MARKER_RE.search(clause_content)
             if next_clause_match:
                 clause_content = clause_content[:next_clause_match.start()].strip()
 
@@ -185,7 +203,7 @@ class HTMLExtractorV2:
         nested = []
 
         # Split by subclause delimiters: (a), (b), (c), etc.
-        subclause_splits = re.split(r'(?=\([a-z]\))', text)
+        subclause_splits = _SUBCLAUSE_SPLIT_RE.split(text)
 
         for subclause_text in subclause_splits:
             subclause_text = subclause_text.strip()
@@ -193,7 +211,7 @@ class HTMLExtractorV2:
                 continue
 
             # Extract the letter
-            subclause_match = re.match(r'\(([a-z])\)(.*)', subclause_text, re.DOTALL)
+            subclause_match = _SUBCLAUSE_RE.match(subclause_text)
             if not subclause_match:
                 continue
 
@@ -201,7 +219,7 @@ class HTMLExtractorV2:
             sub_content = subclause_match.group(2).strip()
 
             # Find where next subclause starts
-            next_sub_match = re.search(r'\([a-z]\)', sub_content)
+            next_sub_match = _SUBCLAUSE_MARKER_RE.search(sub_content)
             if next_sub_match:
                 sub_content = sub_content[:next_sub_match.start()].strip()
 
@@ -226,17 +244,14 @@ class HTMLExtractorV2:
         """Extract roman numeral items: (i), (ii), (iii), etc."""
         items = []
 
-        # Pattern for roman numerals: (i), (ii), (iii), (iv), etc.
-        roman_pattern = r'\(([iv]+)\)'
-
-        roman_splits = re.split(f'(?={roman_pattern})', text)
+        roman_splits = _ROMAN_SPLIT_RE.split(text)
 
         for roman_text in roman_splits:
             roman_text = roman_text.strip()
             if not roman_text:
                 continue
 
-            roman_match = re.match(f'{roman_pattern}(.*)', roman_text, re.DOTALL)
+            roman_match = _ROMAN_RE.match(roman_text)
             if not roman_match:
                 continue
 
@@ -244,7 +259,7 @@ class HTMLExtractorV2:
             roman_content = roman_match.group(2).strip()
 
             # Find next roman numeral
-            next_roman_match = re.search(roman_pattern, roman_content)
+            next_roman_match = _ROMAN_MARKER_RE.search(roman_content)
             if next_roman_match:
                 roman_content = roman_content[:next_roman_match.start()].strip()
 
@@ -300,7 +315,7 @@ TEXT (section {section_number}):
             response_text = response.content[0].text
 
             # Parse JSON
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(response_text)
             if json_match:
                 parsed = json.loads(json_match.group())
                 return {
@@ -13,7 +13,6 @@ from pathlib import Path
 from langchain_community.document_loaders import BSHTMLLoader
 from langchain_text_splitters import HTMLHeaderTextSplitter
 import requests
-from bs4 import BeautifulSoup
 import sys
 
 # Add root ingestion directory to path
@@ -24,6 +23,9 @@ from ingestion.shared.config.settings import CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
+# BeautifulSoup options for BSHTMLLoader: the libxml2 parser, as in Stage 1
+BS_KWARGS = {"features": "lxml"}
+
 
 class HTMLLoader:
     """Load HTML e-laws documents and perform semantic chunking"""
@@ -60,7 +62,7 @@ class HTMLLoader:
                 f.write(response.text)
 
             # Load using BeautifulSoup via LangChain
-            loader = BSHTMLLoader(temp_html_path)
+            loader = BSHTMLLoader(temp_html_path, bs_kwargs=BS_KWARGS)
             docs = loader.load()
 
             logger.info(f"Loaded {len(docs)} documents from HTML")
@@ -87,7 +89,7 @@ class HTMLLoader:
         logger.info(f"Loading HTML from {file_path}")
 
         try:
-            loader = BSHTMLLoader(file_path)
+            loader = BSHTMLLoader(file_path, bs_kwargs=BS_KWARGS)
             docs = loader.load()
 
             logger.info(f"Loaded {len(docs)} documents from {file_path}")
@@ -24,6 +24,12 @@ sys.path.insert(0, str(Path(__file__).parents[3]))
 
 logger = logging.getLogger(__name__)
 
+_REFERENCE_RE = re.compile(
+    r'(?:section|part|subsection|clause|table|figure|schedule)\s+(\d+(?:\.\d+)*(?:\.\d+)?)',
+    re.IGNORECASE
+)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 
 class GPTContentExtractor:
     """Extract structured content from HTML chunks using GPT-4o"""
@@ -129,10 +135,8 @@ Return ONLY valid JSON, no other text."""
         logger.debug(f"Extracting references from content length: {len(content)}")
 
         # Use regex for initial detection
-        reference_pattern = r'(?:section|part|subsection|clause|table|figure|schedule)\s+(\d+(?:\.\d+)*(?:\.\d+)?)'
-
         references = []
-        for match in re.finditer(reference_pattern, content, re.IGNORECASE):
+        for match in _REFERENCE_RE.finditer(content):
             ref_number = match.group(1)
             references.append({
                 "reference": ref_number,
@@ -189,7 +193,7 @@ Text to extract from:
         """Parse GPT extraction response"""
         try:
             # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(response_text)
             if not json_match:
                 logger.warning("No JSON found in response")
                 return {"clauses": [], "items": []}
@@ -13,6 +13,9 @@ thousands of granular nodes for better queryability and search.
 """
 
 import logging
+import functools
+import time
+from collections import defaultdict
 from typing import Dict, List, Any, Optional
 import json
 from pathlib import Path
@@ -24,9 +27,80 @@ sys.path.insert(0, str(Path(__file__).parents[3]))
 from ingestion.shared.src.core.graph_manager import GraphManager
 from ingestion.shared.src.core.embeddings import EmbeddingManager
 from ingestion.shared.src.core.schema import create_elaws_obc_schema
+from neo4j_batches import write_batched
 
 logger = logging.getLogger(__name__)
 
+# Sections are merged on their number, so chunks and documents that share a
+# section reuse one node. Only sections created here are linked to the part;
+# existing ones (including the PDF pipeline's) are returned unchanged. The
+# count is taken for every row before any MERGE runs
+SECTION_QUERY = """
+UNWIND $rows AS row
+OPTIONAL MATCH (existing:Section {section_number: row.number})
+WITH row, count(existing) = 0 AS created
+MERGE (s:Section {section_number: row.number})
+ON CREATE SET s.title = row.number
+WITH s, row, created
+OPTIONAL MATCH (p) WHERE id(p) = $part_id
+FOREACH (_ IN CASE WHEN p IS NULL OR NOT created THEN [] ELSE [1] END |
+    CREATE (p)-[:HAS_SECTION]->(s))
+RETURN row.number AS key, id(s) AS neo4j_id
+"""
+
+CLAUSE_QUERY = """
+UNWIND $rows AS row
+CREATE (c:Clause {
+    clause_number: row.number,
+    text: row.text,
+    embedding: row.embedding,
+    hash: row.hash
+})
+WITH c, row
+OPTIONAL MATCH (s) WHERE id(s) = row.section_id
+FOREACH (_ IN CASE WHEN s IS NULL THEN [] ELSE [1] END |
+    CREATE (s)-[:HAS_CLAUSE]->(c))
+RETURN row.key AS key, id(c) AS neo4j_id
+"""
+
+DEFINITION_QUERY = """
+UNWIND $rows AS row
+CREATE (d:Definition {
+    term: row.term,
+    definition: row.definition,
+    embedding: row.embedding
+})
+WITH d, row
+OPTIONAL MATCH (s) WHERE id(s) = row.section_id
+FOREACH (_ IN CASE WHEN s IS NULL THEN [] ELSE [1] END |
+    CREATE (s)-[:HAS_DEFINITION]->(d))
+RETURN row.key AS key, id(d) AS neo4j_id
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _item_query(label: str, rel_type: str) -> str:
+    """UNWIND query for nested items of one label and relationship type"""
+    return f"""
+    UNWIND $rows AS row
+    CREATE (i:{label} {{
+        number: row.number,
+        text: row.text,
+        embedding: row.embedding,
+        type: row.type
+    }})
+    WITH i, row
+    MATCH (p) WHERE id(p) = row.parent_id
+    CREATE (p)-[:{rel_type}]->(i)
+    RETURN row.key AS key, id(i) AS neo4j_id
+    """
+
+
+@functools.lru_cache(maxsize=1)
+def _get_embedding_manager() -> EmbeddingManager:
+    """Load the embedding model once per process and share it across ingesters"""
+    return EmbeddingManager()
+
 
 class Neo4jHTMLIngester:
     """Ingest fine-grained HTML-extracted data into Neo4j"""
@@ -40,10 +114,12 @@ class Neo4jHTMLIngester:
         """
         self.graph = graph
         self.schema = create_elaws_obc_schema()
-        self.embedding_manager = EmbeddingManager()
+        self.embedding_manager = _get_embedding_manager()
         self.created_nodes = {}
         self.node_count = 0
         self.relationship_count = 0
+        self.timings = defaultdict(float)
+        self._section_ids: Dict[str, Any] = {}
 
     def ingest(self, extracted_data: List[Dict[str, Any]], document_id: str = "obc_html_332_12") -> Dict[str, Any]:
         """
@@ -68,15 +144,22 @@ class Neo4jHTMLIngester:
         }
 
         try:
+            self._section_ids = {}
+            self._create_indexes()
+
             # Step 1: Create document and regulation hierarchy
+            start = time.perf_counter()
             doc_node_id = self._create_document_node(document_id)
             reg_node_id = self._create_regulation_node()
+            self.timings["hierarchy"] += time.perf_counter() - start
 
             stats["nodes_created"] = 2
 
             # Step 2: Create divisions and parts
+            start = time.perf_counter()
             div_nodes = self._create_divisions()
             part_nodes = self._create_parts()
+            self.timings["hierarchy"] += time.perf_counter() - start
             stats["nodes_created"] += len(div_nodes) + len(part_nodes)
 
             # Step 3: Process extracted data
@@ -85,14 +168,10 @@ class Neo4jHTMLIngester:
 
                 try:
                     doc_stats = self._process_document(
-                        document, reg_node_id, part_nodes[0] if part_nodes else None
+                        document, reg_node_id, part_nodes[0] if part_nodes else None, stats["errors"]
                     )
-                    stats["nodes_created"] += doc_stats["nodes_created"]
-                    stats["relationships_created"] += doc_stats["relationships_created"]
-                    stats["clauses_created"] += doc_stats["clauses_created"]
-                    stats["subclauses_created"] += doc_stats["subclauses_created"]
-                    stats["items_created"] += doc_stats["items_created"]
-                    stats["definitions_created"] += doc_stats["definitions_created"]
+                    for key, value in doc_stats.items():
+                        stats[key] += value
 
                 except Exception as e:
                     error_msg = f"Error processing document {doc_idx}: {e}"
@@ -104,6 +183,10 @@ class Neo4jHTMLIngester:
                 f"{stats['relationships_created']} relationships, "
                 f"{stats['clauses_created']} clauses"
             )
+            logger.info(
+                "Phase timings: "
+                + ", ".join(f"{phase}={seconds:.2f}s" for phase, seconds in self.timings.items())
+            )
 
         except Exception as e:
             stats["success"] = False
@@ -112,6 +195,14 @@ class Neo4jHTMLIngester:
 
         return stats
 
+    def _create_indexes(self):
+        """Index Section.section_number, which SECTION_QUERY MERGEs on"""
+        self.graph.execute_query("""
+        CREATE INDEX section_number_idx IF NOT EXISTS
+        FOR (n:Section)
+        ON (n.section_number)
+        """)
+
     def _create_document_node(self, document_id: str) -> str:
         """Create document node"""
         query = """
@@ -146,375 +237,271 @@ class Neo4jHTMLIngester:
         return node_id
 
     def _create_divisions(self) -> list:
-        """Create division nodes"""
+        """Create division nodes and link them to the regulation in one query"""
         divisions = [
             ("A", "Compliance and Objectives"),
             ("B", "Building Occupancy")
         ]
-        created = []
 
-        for div_id, title in divisions:
-            query = """
-            CREATE (d:Division {
-                division_id: $div_id,
-                title: $title
-            })
-            RETURN id(d) as neo4j_id
-            """
-            result = self.graph.execute_query(query, {
-                "div_id": div_id,
-                "title": title
-            })
-            node_id = result[0]["neo4j_id"] if result else None
-
-            if node_id and self.created_nodes.get("regulation"):
-                rel_query = """
-                MATCH (r) WHERE id(r) = $reg_id
-                MATCH (d) WHERE id(d) = $div_id
-                CREATE (r)-[:HAS_DIVISION {sequence: $seq}]->(d)
-                """
-                self.graph.execute_query(rel_query, {
-                    "reg_id": self.created_nodes["regulation"],
-                    "div_id": node_id,
-                    "seq": ord(div_id) - ord('A')
-                })
-
-            self.created_nodes[f"division_{div_id}"] = node_id
-            created.append(node_id)
+        query = """
+        UNWIND $rows AS row
+        CREATE (d:Division {
+            division_id: row.div_id,
+            title: row.title
+        })
+        WITH d, row
+        OPTIONAL MATCH (r) WHERE id(r) = $reg_id
+        FOREACH (_ IN CASE WHEN r IS NULL THEN [] ELSE [1] END |
+            CREATE (r)-[:HAS_DIVISION {sequence: row.seq}]->(d))
+        RETURN row.div_id AS key, id(d) AS neo4j_id
+        """
+        result = self.graph.execute_query(query, {
+            "reg_id": self.created_nodes.get("regulation"),
+            "rows": [
+                {"div_id": div_id, "title": title, "seq": ord(div_id) - ord('A')}
+                for div_id, title in divisions
+            ]
+        })
+        node_ids = {record["key"]: record["neo4j_id"] for record in result}
+
+        created = []
+        for div_id, _ in divisions:
+            self.created_nodes[f"division_{div_id}"] = node_ids.get(div_id)
+            created.append(node_ids.get(div_id))
 
         return created
 
     def _create_parts(self) -> list:
-        """Create part nodes"""
+        """Create part nodes and link them to Division A in one query"""
         parts = [
             ("3", "Fire Protection, Occupant Safety and Accessibility"),
         ]
-        created = []
 
-        for part_num, title in parts:
-            query = """
-            CREATE (p:Part {
-                part_number: $part_num,
-                title: $title
-            })
-            RETURN id(p) as neo4j_id
-            """
-            result = self.graph.execute_query(query, {
-                "part_num": part_num,
-                "title": title
-            })
-            node_id = result[0]["neo4j_id"] if result else None
-
-            if node_id and self.created_nodes.get("division_A"):
-                rel_query = """
-                MATCH (d) WHERE id(d) = $div_id
-                MATCH (p) WHERE id(p) = $part_id
-                CREATE (d)-[:HAS_PART {sequence: $seq}]->(p)
-                """
-                self.graph.execute_query(rel_query, {
-                    "div_id": self.created_nodes["division_A"],
-                    "part_id": node_id,
-                    "seq": int(part_num)
-                })
-
-            self.created_nodes[f"part_{part_num}"] = node_id
-            created.append(node_id)
+        query = """
+        UNWIND $rows AS row
+        CREATE (p:Part {
+            part_number: row.part_num,
+            title: row.title
+        })
+        WITH p, row
+        OPTIONAL MATCH (d) WHERE id(d) = $div_id
+        FOREACH (_ IN CASE WHEN d IS NULL THEN [] ELSE [1] END |
+            CREATE (d)-[:HAS_PART {sequence: row.seq}]->(p))
+        RETURN row.part_num AS key, id(p) AS neo4j_id
+        """
+        result = self.graph.execute_query(query, {
+            "div_id": self.created_nodes.get("division_A"),
+            "rows": [
+                {"part_num": part_num, "title": title, "seq": int(part_num)}
+                for part_num, title in parts
+            ]
+        })
+        node_ids = {record["key"]: record["neo4j_id"] for record in result}
+
+        created = []
+        for part_num, _ in parts:
+            self.created_nodes[f"part_{part_num}"] = node_ids.get(part_num)
+            created.append(node_ids.get(part_num))
 
         return created
 
-    def _process_document(self, document: Dict[str, Any], reg_id: str, part_id: str) -> Dict[str, int]:
-        """Process a single document"""
-        stats = {
-            "nodes_created": 0,
-            "relationships_created": 0,
-            "clauses_created": 0,
-            "subclauses_created": 0,
-            "items_created": 0,
-            "definitions_created": 0,
-        }
+    def _process_document(
+        self, document: Dict[str, Any], reg_id: str, part_id: str, errors: List[str]
+    ) -> Dict[str, int]:
+        """
+        Process a single document.
+
+        A batch that fails to write is recorded in errors and skipped, so the
+        returned counts cover only the nodes that were written.
+        """
+        self._part_id = part_id
+        self._section_numbers: Dict[str, None] = {}
+        self._clause_buffer = []
+        self._item_buffer = []
+        self._definition_buffer = []
 
         extracted_chunks = document.get("extracted_chunks", [])
 
+        start = time.perf_counter()
         for chunk_idx, chunk in enumerate(extracted_chunks):
             try:
-                chunk_stats = self._process_chunk(chunk, part_id)
-                for key in stats:
-                    stats[key] += chunk_stats.get(key, 0)
+                self._process_chunk(chunk, part_id)
 
             except Exception as e:
                 logger.error(f"Error processing chunk {chunk_idx}: {e}")
                 continue
-
-        return stats
-
-    def _process_chunk(self, chunk: Dict[str, Any], part_id: str) -> Dict[str, int]:
-        """Process a single chunk and create nodes for clauses"""
-        stats = {
-            "nodes_created": 0,
-            "relationships_created": 0,
-            "clauses_created": 0,
-            "subclauses_created": 0,
-            "items_created": 0,
-            "definitions_created": 0,
+        self.timings["chunks"] += time.perf_counter() - start
+
+        node_ids = self._flush_buffers(errors)
+
+        # Items whose parent was not written are dropped by the query's MATCH
+        clauses = [row for row in self._clause_buffer if row["key"] in node_ids]
+        items = [row for row in self._item_buffer if row["key"] in node_ids]
+        definitions = [row for row in self._definition_buffer if row["key"] in node_ids]
+
+        return {
+            "nodes_created": len(clauses) + len(items) + len(definitions),
+            "relationships_created": len(items),
+            "clauses_created": len(clauses),
+            "subclauses_created": sum(1 for row in items if row["label"] == "SubClause"),
+            "items_created": sum(1 for row in items if "item" in row["type"].lower()),
+            "definitions_created": len(definitions),
         }
 
+    def _process_chunk(self, chunk: Dict[str, Any], part_id: str):
+        """Process a single chunk and buffer rows for its clauses and definitions"""
         extracted = chunk.get("extracted", {})
         metadata = chunk.get("content_metadata", {})
 
-        # Get or create section
+        # Rows refer to their section by number; the sections are merged
+        # together when the buffers are flushed
         section_number = metadata.get("section", "")
-        section_node_id = self._get_or_create_section(section_number, part_id)
+        if section_number and section_number not in self._section_ids:
+            self._section_numbers[section_number] = None
 
         # Process clauses
         clauses = extracted.get("clauses", [])
         for clause in clauses:
-            clause_stats = self._process_clause(clause, section_node_id)
-            stats["nodes_created"] += clause_stats["nodes_created"]
-            stats["relationships_created"] += clause_stats["relationships_created"]
-            stats["clauses_created"] += clause_stats["clauses_created"]
-            stats["subclauses_created"] += clause_stats["subclauses_created"]
-            stats["items_created"] += clause_stats["items_created"]
+            self._process_clause(clause, section_number)
 
         # Process definitions
         definitions = extracted.get("definitions", [])
         for definition in definitions:
-            def_node_id = self._create_definition_node(definition, section_node_id)
-            if def_node_id:
-                stats["definitions_created"] += 1
-                stats["nodes_created"] += 1
-
-        return stats
-
-    def _get_or_create_section(self, section_number: str, part_id: str) -> Optional[str]:
-        """Get or create section node"""
-        if not section_number:
-            return part_id  # Use part as parent if no section
-
-        # Check if section exists
-        check_query = """
-        MATCH (s:Section {section_number: $section_num})
-        RETURN id(s) as neo4j_id
-        """
-        result = self.graph.execute_query(check_query, {"section_num": section_number})
-
-        if result:
-            return result[0]["neo4j_id"]
-
-        # Create new section
-        create_query = """
-        CREATE (s:Section {
-            section_number: $section_num,
-            title: $section_num
-        })
-        RETURN id(s) as neo4j_id
-        """
-        result = self.graph.execute_query(create_query, {"section_num": section_number})
-        section_id = result[0]["neo4j_id"] if result else None
-
-        # Link to part
-        if section_id and part_id:
-            rel_query = """
-            MATCH (p) WHERE id(p) = $part_id
-            MATCH (s) WHERE id(s) = $section_id
-            CREATE (p)-[:HAS_SECTION]->(s)
-            """
-            self.graph.execute_query(rel_query, {
-                "part_id": part_id,
-                "section_id": section_id
+            self._definition_buffer.append({
+                "key": f"definition:{len(self._definition_buffer)}",
+                "term": definition.get("term", ""),
+                "definition": definition.get("definition") or "",
+                "section_number": section_number,
             })
 
-        return section_id
-
-    def _process_clause(self, clause: Dict[str, Any], parent_section_id: str) -> Dict[str, int]:
-        """Process a clause and create nodes for it and nested items"""
-        stats = {
-            "nodes_created": 0,
-            "relationships_created": 0,
-            "clauses_created": 0,
-            "subclauses_created": 0,
-            "items_created": 0,
-        }
-
-        clause_number = clause.get("number", "")
-        clause_text = clause.get("text", "")
-        clause_type = clause.get("type", "clause")
-
-        # Create clause node
-        clause_node_id = self._create_clause_node(
-            clause_number, clause_text, parent_section_id
-        )
-
-        if clause_node_id:
-            stats["nodes_created"] += 1
-            stats["clauses_created"] += 1
-
-            # Process nested items
-            nested_items = clause.get("nested_items", [])
-            for nested_item in nested_items:
-                nested_stats = self._process_nested_item(
-                    nested_item, clause_node_id
-                )
-                stats["nodes_created"] += nested_stats["nodes_created"]
-                stats["relationships_created"] += nested_stats["relationships_created"]
-                stats["subclauses_created"] += nested_stats["subclauses_created"]
-                stats["items_created"] += nested_stats["items_created"]
-
-        return stats
+    def _process_clause(self, clause: Dict[str, Any], section_number: str):
+        """Buffer a clause row and the rows for its nested items"""
+        clause_key = f"clause:{len(self._clause_buffer)}"
+        self._clause_buffer.append({
+            "key": clause_key,
+            "number": clause.get("number", ""),
+            "text": clause.get("text") or "",
+            "section_number": section_number,
+        })
 
-    def _process_nested_item(self, item: Dict[str, Any], parent_id: str, depth: int = 1) -> Dict[str, int]:
-        """Process nested items (subclauses, items)"""
-        stats = {
-            "nodes_created": 0,
-            "relationships_created": 0,
-            "subclauses_created": 0,
-            "items_created": 0,
-        }
+        # Process nested items
+        for nested_item in clause.get("nested_items", []):
+            self._process_nested_item(nested_item, clause_key)
 
-        item_number = item.get("number", "")
-        item_text = item.get("text", "")
+    def _process_nested_item(self, item: Dict[str, Any], parent_key: str, depth: int = 1):
+        """Buffer rows for nested items (subclauses, items)"""
         item_type = item.get("type", "item")
+        item_key = f"item:{len(self._item_buffer)}"
+
+        self._item_buffer.append({
+            "key": item_key,
+            "parent_key": parent_key,
+            "depth": depth,
+            "number": item.get("number", ""),
+            "text": item.get("text") or "",
+            "type": item_type,
+            "label": "SubClause" if "subclause" in item_type.lower() else "Item",
+            "rel_type": f"HAS_{item_type.upper()}",
+        })
 
-        # Create node
-        item_node_id = self._create_item_node(item_number, item_text, item_type)
-
-        if item_node_id:
-            stats["nodes_created"] += 1
-
-            # Link to parent
-            self.graph.execute_query(
-                f"MATCH (p) WHERE id(p) = $parent_id MATCH (i) WHERE id(i) = $item_id CREATE (p)-[:HAS_{item_type.upper()}]->(i)",
-                {"parent_id": parent_id, "item_id": item_node_id}
-            )
-            stats["relationships_created"] += 1
-
-            # Count by type
-            if "subclause" in item_type.lower():
-                stats["subclauses_created"] += 1
-            elif "item" in item_type.lower():
-                stats["items_created"] += 1
-
-            # Process deeply nested items
-            nested = item.get("nested_items", [])
-            if nested and depth < 3:  # Limit recursion depth
-                for nested_item in nested:
-                    nested_stats = self._process_nested_item(
-                        nested_item, item_node_id, depth + 1
-                    )
-                    for key in nested_stats:
-                        stats[key] += nested_stats[key]
-
-        return stats
-
-    def _create_clause_node(self, number: str, text: str, section_id: str) -> Optional[str]:
-        """Create a clause node with embedding"""
-        try:
-            # Generate embedding
-            embedding = self.embedding_manager.embed_text(text)
-
-            query = """
-            CREATE (c:Clause {
-                clause_number: $number,
-                text: $text,
-                embedding: $embedding,
-                hash: $hash
-            })
-            RETURN id(c) as neo4j_id
-            """
-
-            result = self.graph.execute_query(query, {
-                "number": number,
-                "text": text[:1000],  # Limit to 1000 chars
-                "embedding": embedding,
-                "hash": hashlib.md5(text.encode()).hexdigest()
-            })
-
-            clause_id = result[0]["neo4j_id"] if result else None
-
-            # Link to section
-            if clause_id and section_id:
-                self.graph.execute_query(
-                    "MATCH (s) WHERE id(s) = $section_id MATCH (c) WHERE id(c) = $clause_id CREATE (s)-[:HAS_CLAUSE]->(c)",
-                    {"section_id": section_id, "clause_id": clause_id}
-                )
-
-            return clause_id
-
-        except Exception as e:
-            logger.error(f"Error creating clause node: {e}")
-            return None
-
-    def _create_item_node(self, number: str, text: str, item_type: str = "item") -> Optional[str]:
-        """Create an item (subclause or item) node"""
-        try:
-            # Generate embedding
-            embedding = self.embedding_manager.embed_text(text)
-
-            node_label = "SubClause" if "subclause" in item_type.lower() else "Item"
-
-            query = f"""
-            CREATE (i:{node_label} {{
-                number: $number,
-                text: $text,
-                embedding: $embedding,
-                type: $type
-            }})
-            RETURN id(i) as neo4j_id
-            """
-
-            result = self.graph.execute_query(query, {
-                "number": number,
-                "text": text[:1000],
-                "embedding": embedding,
-                "type": item_type
-            })
-
-            return result[0]["neo4j_id"] if result else None
-
-        except Exception as e:
-            logger.error(f"Error creating item node: {e}")
-            return None
-
-    def _create_definition_node(self, definition: Dict[str, str], section_id: str) -> Optional[str]:
-        """Create a definition node"""
-        try:
-            term = definition.get("term", "")
-            definition_text = definition.get("definition", "")
-
-            embedding = self.embedding_manager.embed_text(definition_text)
-
-            query = """
-            CREATE (d:Definition {
-                term: $term,
-                definition: $definition,
-                embedding: $embedding
-            })
-            RETURN id(d) as neo4j_id
-            """
+        # Process deeply nested items
+        nested = item.get("nested_items", [])
+        if nested and depth < 3:  # Limit recursion depth
+            for nested_item in nested:
+                self._process_nested_item(nested_item, item_key, depth + 1)
 
-            result = self.graph.execute_query(query, {
-                "term": term,
-                "definition": definition_text,
-                "embedding": embedding
-            })
-
-            def_id = result[0]["neo4j_id"] if result else None
+    def _flush_buffers(self, errors: List[str]) -> Dict[str, Any]:
+        """
+        Write the buffered sections, clauses, nested items and definitions with UNWIND batches
 
-            # Link to section if provided
-            if def_id and section_id:
-                self.graph.execute_query(
-                    "MATCH (s) WHERE id(s) = $section_id MATCH (d) WHERE id(d) = $def_id CREATE (s)-[:HAS_DEFINITION]->(d)",
-                    {"section_id": section_id, "def_id": def_id}
-                )
+        Returns:
+            Mapping of row key to node id for every clause, item and definition written
+        """
+        node_ids = {}
+
+        self._section_ids.update(write_batched(
+            self.graph, SECTION_QUERY, [{"number": number} for number in self._section_numbers],
+            params={"part_id": self._part_id}, timings=self.timings, errors=errors
+        ))
+
+        clause_rows = [
+            {
+                "key": row["key"],
+                "number": row["number"],
+                "text": row["text"][:1000],  # Limit to 1000 chars
+                "hash": hashlib.md5(row["text"].encode()).hexdigest(),
+                "section_id": self._section_id(row["section_number"]),
+            }
+            for row in self._clause_buffer
+        ]
+        texts = [row["text"] for row in self._clause_buffer]
+        node_ids.update(write_batched(
+            self.graph, CLAUSE_QUERY, clause_rows,
+            em=self.embedding_manager, texts=texts, timings=self.timings, errors=errors
+        ))
+
+        # Parents must exist before their children, so flush one depth at a time
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in self._item_buffer:
+            groups.setdefault((row["depth"], row["label"], row["rel_type"]), []).append(row)
+
+        for depth, label, rel_type in sorted(groups):
+            rows = groups[(depth, label, rel_type)]
+            item_rows = [
+                {
+                    "key": row["key"],
+                    "parent_id": node_ids.get(row["parent_key"]),
+                    "number": row["number"],
+                    "text": row["text"][:1000],
+                    "type": row["type"],
+                }
+                for row in rows
+            ]
+            texts = [row["text"] for row in rows]
+            node_ids.update(write_batched(
+                self.graph, _item_query(label, rel_type), item_rows,
+                em=self.embedding_manager, texts=texts, timings=self.timings, errors=errors
+            ))
+
+        definition_rows = [
+            {
+                "key": row["key"],
+                "term": row["term"],
+                "definition": row["definition"],
+                "section_id": self._section_id(row["section_number"]),
+            }
+            for row in self._definition_buffer
+        ]
+        texts = [row["definition"] for row in self._definition_buffer]
+        node_ids.update(write_batched(
+            self.graph, DEFINITION_QUERY, definition_rows,
+            em=self.embedding_manager, texts=texts, timings=self.timings, errors=errors
+        ))
 
-            return def_id
+        return node_ids
 
-        except Exception as e:
-            logger.error(f"Error creating definition node: {e}")
-            return None
+    def _section_id(self, section_number: str) -> Optional[str]:
+        """Node id of a merged section, or of the part when there is no section"""
+        if not section_number:
+            return self._part_id  # Use part as parent if no section
+        return self._section_ids.get(section_number)
 
 
 def main():
     """Run Neo4j ingestion"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stage 3: Neo4j ingestion for HTML-extracted data")
+    parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const="data/ingestion_html.prof",
+        default=None,
+        help="Run ingestion under cProfile and dump pstats to this file"
+    )
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO)
 
     extracted_path = "data/gpt_extracted.json"
@@ -531,7 +518,18 @@ def main():
     # Ingest to Neo4j
     graph = GraphManager()
     ingester = Neo4jHTMLIngester(graph)
-    stats = ingester.ingest(documents)
+
+    if args.profile:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        stats = profiler.runcall(ingester.ingest, documents)
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        logger.info(f"Profile written to {args.profile}")
+    else:
+        stats = ingester.ingest(documents)
 
     # Save stats
     with open("data/ingestion_stats_html.json", "w") as f:
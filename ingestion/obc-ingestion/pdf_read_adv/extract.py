@@ -46,24 +46,23 @@ def main():
         print(f"Processing: {pdf_name}")
 
         try:
-            # Read PDF
-            reader = OBCStructuredReader(str(pdf_file))
-
-            # Extract
-            data = reader.read()
-
-            # Save JSON
-            json_file = pdf_name.replace(".pdf", "_structure.json")
-            json_path = os.path.join(output_dir, json_file)
-            reader.export_json(json_path)
-            print(f"  ✓ Saved: {json_file}")
-
-            # Extract images
-            image_dir = pdf_name.replace(".pdf", "_images")
-            images = reader.extract_images(os.path.join(output_dir, image_dir))
-
-            if images:
-                print(f"  ✓ Extracted {len(images)} images")
+            # Read PDF (the reader keeps one pdfplumber handle open until exit)
+            with OBCStructuredReader(str(pdf_file)) as reader:
+                # Extract
+                data = reader.read()
+
+                # Save JSON
+                json_file = pdf_name.replace(".pdf", "_structure.json")
+                json_path = os.path.join(output_dir, json_file)
+                reader.export_json(json_path)
+                print(f"  ✓ Saved: {json_file}")
+
+                # Extract images
+                image_dir = pdf_name.replace(".pdf", "_images")
+                images = reader.extract_images(os.path.join(output_dir, image_dir))
+
+                if images:
+                    print(f"  ✓ Extracted {len(images)} images")
 
             print()
 
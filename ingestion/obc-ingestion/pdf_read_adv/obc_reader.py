@@ -11,16 +11,185 @@ Designed to handle:
 
 import PyPDF2
 import pdfplumber
-from typing import Dict, List, Any, Optional, Tuple
+try:
+    # PDFium (C++) extracts text several times faster than PyPDF2
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 import re
 import logging
-from dataclasses import dataclass, asdict
-import json
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from dataclasses import dataclass
+import orjson
 import os
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Section header line: "6.1.1.    Section Title" (matched per line of page text)
+_SECTION_RE = re.compile(r'^[^\S\n]*(\d+(?:\.\d+)*)\.[^\S\n]+(\S.*)$', re.MULTILINE)
+# Line that starts a table and ends the current section body
+_TABLE_LINE_RE = re.compile(r'^[^\S\n]*Table', re.MULTILINE)
+# Whitespace that line-by-line stripping would remove from inside a body
+_LINE_PADDING_RE = re.compile(r'[^\S\n]\n|\n[^\S\n]|\n\n')
+# Cross-references like "Clause 3.1.5.5(1)(b)"
+_REFERENCE_RE = re.compile(r'(Clause|Section|Table)\s+([0-9\.()]+)')
+_REFERENCE_KEYWORDS = ('Clause', 'Section', 'Table')
+_TABLE_NAME_RE = re.compile(r'Table\s+([\w\-\.]+)')
+
+# Minimum pages handed to each text-extraction worker process
+PAGES_PER_WORKER = 25
+
+
+def _section_body(text: str, start: int, end: int) -> str:
+    """
+    Body of a section: its stripped, non-blank lines up to the first 'Table' line.
+
+    Finds the cut-off with one regex search. When no line carries padding or
+    is blank the stripped slice is already the body; otherwise the lines are
+    stripped/filtered/joined with C-implemented builtins, so no Python-level
+    loop runs per line.
+    """
+    table_line = _TABLE_LINE_RE.search(text, start, end)
+    if table_line:
+        end = table_line.start()
+    body = text[start:end].strip()
+    if not _LINE_PADDING_RE.search(body):
+        return body
+    return '\n'.join(filter(None, map(str.strip, body.split('\n'))))
+
+
+# PDFium marks a hyphen it joins across a line break ("fire-resistance")
+# with U+FFFE and may emit \x02 for soft hyphens; PyPDF2 gives a plain
+# hyphen and nothing
+_PDFIUM_HYPHENS = str.maketrans({'\ufffe': '-', '\x02': None})
+
+
+def _iter_page_range(pdf_path: str, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+    """Yield text for pages [start, stop) one page at a time"""
+    if pdfium is None:
+        yield from _iter_page_range_pypdf2(pdf_path, start, stop)
+        return
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for page_idx in range(start, stop):
+            page = pdf[page_idx]
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            yield {
+                'page': page_idx + 1,
+                # PDFium separates lines with CRLF
+                'text': text.replace('\r\n', '\n').translate(_PDFIUM_HYPHENS) if text else ""
+            }
+    finally:
+        pdf.close()
+
+
+def _iter_page_range_pypdf2(pdf_path: str, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+    """Pure-Python fallback used when pypdfium2 is not installed"""
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+
+        for page_idx in range(start, stop):
+            text = reader.pages[page_idx].extract_text()
+            yield {
+                'page': page_idx + 1,
+                'text': text if text else ""
+            }
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[Dict[str, Any]]:
+    """Extract text for pages [start, stop) in a worker process"""
+    return list(_iter_page_range(pdf_path, start, stop))
+
+
+def _scan_references(contents: List[str]) -> Iterator[Tuple[int, str, str, int, int]]:
+    """
+    Scan many texts for references in a single regex pass.
+
+    The texts are joined with NUL separators, which no reference can match
+    across, and each hit is mapped back to its text with a binary search.
+
+    Yields:
+        (text index, reference type, reference target, start, end) with
+        start/end relative to that text
+    """
+    offsets = []
+    position = 0
+    for content in contents:
+        offsets.append(position)
+        position += len(content) + 1
+
+    for match in _REFERENCE_RE.finditer('\0'.join(contents)):
+        idx = bisect_right(offsets, match.start()) - 1
+        base = offsets[idx]
+        yield idx, match.group(1), match.group(2), match.start() - base, match.end() - base
+
+
+def _references_by_table(
+    table_names: Iterable[str],
+    references: List[Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group references under every table name found in the reference target.
+
+    A table is referenced when its name is a substring of the target. Only the
+    target substrings whose lengths match a table name are looked up, so the
+    cost grows with the number of references, not references x tables.
+    """
+    names = set(table_names)
+    lengths = sorted({len(name) for name in names})
+    by_table = defaultdict(list)
+
+    for ref in references:
+        target = ref['target']
+        found = set()
+        for length in lengths:
+            for i in range(len(target) - length + 1):
+                candidate = target[i:i + length]
+                if candidate in names:
+                    found.add(candidate)
+        for name in found:
+            by_table[name].append(ref)
+
+    return by_table
+
+
+def _save_png(image, filepath: str):
+    """Save a PIL image as PNG favouring encode speed over file size"""
+    image.save(filepath, format='PNG', compress_level=1, optimize=False)
+
+
+def _rows_to_dicts(headers: List[str], rows: List[List[Any]]) -> List[Dict[str, str]]:
+    """Convert raw table rows to header-keyed dicts with stripped cell text"""
+    width = max((len(row) for row in rows), default=0)
+    headers_padded = headers + [f"Col_{i}" for i in range(len(headers), width)]
+    _strip = str.strip
+
+    return [
+        dict(zip(headers_padded, [
+            _strip(cell) if isinstance(cell, str) else (_strip(str(cell)) if cell else "")
+            for cell in row
+        ]))
+        for row in rows
+    ]
+
+
+def _iter_pages(pdf) -> Iterator[Tuple[int, Any]]:
+    """Yield (page_num, page), flushing each page's cached layout after use"""
+    for page_num, page in enumerate(pdf.pages, 1):
+        try:
+            yield page_num, page
+        finally:
+            page.flush_cache()
+
 
 @dataclass
 class Section:
@@ -52,11 +221,37 @@ class TableData:
             self.footnotes = []
 
 
+def _section_to_dict(section: Section) -> Dict[str, Any]:
+    """Shallow dict view of a Section (avoids the deep copy done by asdict)"""
+    return {
+        'number': section.number,
+        'title': section.title,
+        'content': section.content,
+        'page': section.page,
+        'depth': section.depth,
+        'subsections': [_section_to_dict(s) for s in section.subsections]
+    }
+
+
+def _table_to_dict(table: TableData) -> Dict[str, Any]:
+    """Shallow dict view of a TableData"""
+    return {
+        'name': table.name,
+        'title': table.title,
+        'page': table.page,
+        'headers': table.headers,
+        'rows': table.rows,
+        'footnotes': table.footnotes
+    }
+
+
 class OBCStructuredReader:
     """
     Extracts OBC with structural awareness.
 
     Uses pdfplumber for tables + custom parsing for hierarchy.
+    The pdfplumber document is opened once and shared by every method;
+    use the reader as a context manager (or call close()) to release it.
     """
 
     def __init__(self, pdf_path: str):
@@ -64,6 +259,27 @@ class OBCStructuredReader:
         self.sections: List[Section] = []
         self.tables: List[TableData] = []
         self.references: List[Dict] = []
+        self._sections_by_page: Dict[int, List[Section]] = defaultdict(list)
+        self._page_count = 0
+        self._plumber_pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the shared pdfplumber document"""
+        if self._plumber_pdf is not None:
+            self._plumber_pdf.close()
+            self._plumber_pdf = None
+
+    def _open_pdf(self):
+        """Return the shared pdfplumber document, opening it on first use"""
+        if self._plumber_pdf is None:
+            self._plumber_pdf = pdfplumber.open(self.pdf_path)
+        return self._plumber_pdf
 
     def read(self) -> Dict[str, Any]:
         """
@@ -79,11 +295,9 @@ class OBCStructuredReader:
         """
         logger.info(f"Reading OBC from: {self.pdf_path}")
 
-        # Extract text with PyPDF2 for structure
-        text_pages = self._extract_with_pypdf2()
-
-        # Parse sections and hierarchy
-        self._parse_sections(text_pages)
+        # Extract text (PDFium, or PyPDF2 as fallback) and parse sections
+        # page by page as the text streams in
+        self._parse_sections(self._iter_pages())
 
         # Extract tables with pdfplumber
         self._extract_tables_with_pdfplumber()
@@ -92,88 +306,68 @@ class OBCStructuredReader:
         self._find_references()
 
         return {
-            'sections': [asdict(s) for s in self.sections],
-            'tables': [asdict(t) for t in self.tables],
+            'sections': [_section_to_dict(s) for s in self.sections],
+            'tables': [_table_to_dict(t) for t in self.tables],
             'references': self.references,
             'metadata': {
                 'total_sections': len(self.sections),
                 'total_tables': len(self.tables),
-                'total_pages': len(text_pages)
+                'total_pages': self._page_count
             }
         }
 
-    def _extract_with_pypdf2(self) -> List[Dict[str, str]]:
-        """Extract text preserving page boundaries"""
-        pages = []
+    def _iter_pages(self) -> Iterator[Dict[str, str]]:
+        """Yield page text in page order without holding every page in memory"""
+        total_pages = len(self._open_pdf().pages)
 
-        with open(self.pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
+        workers = min(os.cpu_count() or 1, max(1, total_pages // PAGES_PER_WORKER))
+        step = max(1, -(-total_pages // workers))  # ceil division
+        starts = range(0, total_pages, step)
+        stops = [min(start + step, total_pages) for start in starts]
 
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                pages.append({
-                    'page': page_num,
-                    'text': text if text else ""
-                })
+        if workers == 1:
+            yield from _iter_page_range(self.pdf_path, 0, total_pages)
+        else:
+            # Page parsing is CPU-bound pure Python, so spread it across processes;
+            # map() hands chunks back in page order
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk in executor.map(_extract_page_range, repeat(self.pdf_path), starts, stops):
+                    yield from chunk
 
-        logger.info(f"Extracted {len(pages)} pages")
-        return pages
+        logger.info(f"Extracted {total_pages} pages")
 
-    def _parse_sections(self, pages: List[Dict[str, str]]):
+    def _parse_sections(self, pages: Iterable[Dict[str, str]]):
         """Parse hierarchical section structure"""
 
         for page_data in pages:
             text = page_data['text']
             page_num = page_data['page']
+            self._page_count += 1
 
-            # Split by lines for processing
-            lines = text.split('\n')
-
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
-
-                # Detect section header pattern: "6.1.1.    Section Title"
-                section_match = re.match(r'^(\d+(?:\.\d+)*)\.\s+(.*)$', line)
-
-                if section_match:
-                    section_num = section_match.group(1)
-                    section_title = section_match.group(2).strip()
-
-                    # Collect content until next section
-                    content_lines = []
-                    i += 1
-
-                    while i < len(lines):
-                        next_line = lines[i].strip()
-
-                        # Stop if we hit another section
-                        if re.match(r'^(\d+(?:\.\d+)*)\.\s+', next_line):
-                            break
+            # One scan over the page for all headers; content is the text
+            # between consecutive headers
+            matches = list(_SECTION_RE.finditer(text))
 
-                        # Stop if we hit a table
-                        if next_line.startswith('Table'):
-                            break
+            for section_match, next_match in zip(matches, matches[1:] + [None]):
+                section_num = section_match.group(1)
+                section_title = section_match.group(2).strip()
 
-                        if next_line:
-                            content_lines.append(next_line)
+                body_end = next_match.start() if next_match else len(text)
 
-                        i += 1
+                # Content stops if we hit a table
+                content = _section_body(text, section_match.end(), body_end)
+                depth = len(section_num.split('.'))
 
-                    content = '\n'.join(content_lines).strip()
-                    depth = len(section_num.split('.'))
+                section = Section(
+                    number=section_num,
+                    title=section_title,
+                    content=content,
+                    page=page_num,
+                    depth=depth
+                )
 
-                    section = Section(
-                        number=section_num,
-                        title=section_title,
-                        content=content,
-                        page=page_num,
-                        depth=depth
-                    )
-
-                    self.sections.append(section)
-                else:
-                    i += 1
+                self.sections.append(section)
+                self._sections_by_page[page_num].append(section)
 
         logger.info(f"Parsed {len(self.sections)} sections")
 
@@ -181,41 +375,35 @@ class OBCStructuredReader:
         """Extract tables preserving structure"""
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    tables = page.extract_tables()
+            pdf = self._open_pdf()
+            for page_num, page in _iter_pages(pdf):
+                tables = page.extract_tables()
+
+                if not tables:
+                    continue
 
-                    if not tables:
+                for table_idx, table in enumerate(tables):
+                    if not table:
                         continue
 
-                    for table_idx, table in enumerate(tables):
-                        if not table:
-                            continue
+                    # First row is headers
+                    headers = [str(cell).strip() if cell else "" for cell in table[0]]
 
-                        # First row is headers
-                        headers = [str(cell).strip() if cell else "" for cell in table[0]]
-
-                        # Remaining rows are data
-                        rows = []
-                        for row in table[1:]:
-                            row_dict = {}
-                            for col_idx, cell in enumerate(row):
-                                header = headers[col_idx] if col_idx < len(headers) else f"Col_{col_idx}"
-                                row_dict[header] = str(cell).strip() if cell else ""
-                            rows.append(row_dict)
-
-                        # Try to find table name from previous content
-                        table_name = self._find_table_name(page_num, table_idx)
-
-                        table = TableData(
-                            name=table_name,
-                            title=f"Table on page {page_num}",
-                            page=page_num,
-                            headers=headers,
-                            rows=rows
-                        )
+                    # Remaining rows are data
+                    rows = _rows_to_dicts(headers, table[1:])
 
-                        self.tables.append(table)
+                    # Try to find table name from previous content
+                    table_name = self._find_table_name(page_num, table_idx)
+
+                    table = TableData(
+                        name=table_name,
+                        title=f"Table on page {page_num}",
+                        page=page_num,
+                        headers=headers,
+                        rows=rows
+                    )
+
+                    self.tables.append(table)
 
             logger.info(f"Extracted {len(self.tables)} tables")
 
@@ -225,33 +413,32 @@ class OBCStructuredReader:
     def _find_table_name(self, page_num: int, table_idx: int) -> str:
         """Find table name/caption"""
         # Look in sections on this page for table references
-        for section in self.sections:
-            if section.page == page_num:
-                match = re.search(r'Table\s+([\w\-\.]+)', section.content)
-                if match:
-                    return match.group(1)
+        for section in self._sections_by_page.get(page_num, ()):
+            # Substring check is far cheaper than the regex on sections without tables
+            if 'Table' not in section.content:
+                continue
+            match = _TABLE_NAME_RE.search(section.content)
+            if match:
+                return match.group(1)
 
         return f"Table_{page_num}_{table_idx}"
 
     def _find_references(self):
         """Find cross-references and citations"""
-
-        # Pattern for references like "Clause 3.1.5.5(1)(b)"
-        reference_pattern = r'(Clause|Section|Table)\s+([0-9\.()]+)'
-
-        for section in self.sections:
-            matches = re.finditer(reference_pattern, section.content)
-
-            for match in matches:
-                ref_type = match.group(1)
-                ref_target = match.group(2)
-
-                self.references.append({
-                    'source': section.number,
-                    'type': ref_type,
-                    'target': ref_target,
-                    'context': section.content[max(0, match.start()-50):match.end()+50]
-                })
+        # Skip sections that can't contain a reference
+        sections = [
+            section for section in self.sections
+            if any(keyword in section.content for keyword in _REFERENCE_KEYWORDS)
+        ]
+        contents = [section.content for section in sections]
+
+        for idx, ref_type, ref_target, start, end in _scan_references(contents):
+            self.references.append({
+                'source': sections[idx].number,
+                'type': ref_type,
+                'target': ref_target,
+                'context': contents[idx][max(0, start - 50):end + 50]
+            })
 
         logger.info(f"Found {len(self.references)} cross-references")
 
@@ -276,50 +463,68 @@ class OBCStructuredReader:
         os.makedirs(output_dir, exist_ok=True)
 
         images_extracted = []
+        pending = []  # (cropped PIL image, output path, metadata)
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Get all images on this page
-                    page_images = page.images
-
-                    for img_idx, img in enumerate(page_images, 1):
-                        try:
-                            # Get image data
-                            img_obj = page.within_bbox(img['top'], img['x0'], img['bottom'], img['x1']).images
-
-                            if img_obj:
-                                # Extract and save using pdfplumber's crop method
-                                cropped = page.crop((img['x0'], img['top'], img['x1'], img['bottom']))
-                                im = cropped.to_image()
-
-                                # Generate filename
-                                filename = f"page_{page_num:03d}_img_{img_idx:02d}.png"
-                                filepath = os.path.join(output_dir, filename)
-
-                                # Save image
-                                im.save(filepath)
-
-                                # Record metadata
-                                images_extracted.append({
-                                    'page': page_num,
-                                    'image_num': img_idx,
-                                    'filename': filename,
-                                    'path': os.path.abspath(filepath),
-                                    'bbox': {
-                                        'x0': img['x0'],
-                                        'y0': img['top'],
-                                        'x1': img['x1'],
-                                        'y1': img['bottom']
-                                    }
-                                })
-
-                                logger.debug(f"Extracted image: {filename}")
-
-                        except Exception as e:
-                            logger.warning(f"Failed to extract image on page {page_num}: {e}")
+            pdf = self._open_pdf()
+            for page_num, page in _iter_pages(pdf):
+                # Get all images on this page
+                page_images = page.images
+
+                if not page_images:
+                    continue
+
+                # Rasterize the page once and crop every image out of it
+                rendered = page.to_image().original
+                scale = rendered.width / float(page.width)
+                x_off, y_off = page.bbox[0], page.bbox[1]
+
+                for img_idx, img in enumerate(page_images, 1):
+                    try:
+                        box = (
+                            max(0, int((img['x0'] - x_off) * scale)),
+                            max(0, int((img['top'] - y_off) * scale)),
+                            min(rendered.width, round((img['x1'] - x_off) * scale)),
+                            min(rendered.height, round((img['bottom'] - y_off) * scale))
+                        )
+                        if box[2] <= box[0] or box[3] <= box[1]:
                             continue
 
+                        # Generate filename
+                        filename = f"page_{page_num:03d}_img_{img_idx:02d}.png"
+                        filepath = os.path.join(output_dir, filename)
+
+                        pending.append((rendered.crop(box), filepath, {
+                            'page': page_num,
+                            'image_num': img_idx,
+                            'filename': filename,
+                            'path': os.path.abspath(filepath),
+                            'bbox': {
+                                'x0': img['x0'],
+                                'y0': img['top'],
+                                'x1': img['x1'],
+                                'y1': img['bottom']
+                            }
+                        }))
+
+                    except Exception as e:
+                        logger.warning(f"Failed to extract image on page {page_num}: {e}")
+                        continue
+
+            # PNG encoding releases the GIL, so save images concurrently
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = {
+                    executor.submit(_save_png, image, filepath): metadata
+                    for image, filepath, metadata in pending
+                }
+                for future, metadata in futures.items():
+                    try:
+                        future.result()
+                        images_extracted.append(metadata)
+                        logger.debug(f"Extracted image: {metadata['filename']}")
+                    except Exception as e:
+                        logger.warning(f"Failed to save image on page {metadata['page']}: {e}")
+
             logger.info(f"Extracted {len(images_extracted)} images to {output_dir}")
             return images_extracted
 
@@ -331,8 +536,8 @@ class OBCStructuredReader:
         """Export structured data to JSON"""
         data = self.read()
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
         logger.info(f"Exported to {output_path}")
 
@@ -368,6 +573,12 @@ class OBCStructuredReader:
                 }
             })
 
+        # Index references by the table names they mention
+        refs_by_table = _references_by_table(
+            (table.name for table in self.tables),
+            self.references
+        )
+
         # Create Table nodes
         for i, table in enumerate(self.tables):
             table_id = f"table_{table.name}"
@@ -385,15 +596,14 @@ class OBCStructuredReader:
             })
 
             # Link table to sections that reference it
-            for ref in self.references:
-                if table.name in ref['target']:
-                    if ref['source'] in section_map:
-                        relationships.append({
-                            'source_id': section_map[ref['source']],
-                            'target_id': table_id,
-                            'type': 'REFERENCES',
-                            'properties': {'context': ref['context'][:200]}
-                        })
+            for ref in refs_by_table.get(table.name, ()):
+                if ref['source'] in section_map:
+                    relationships.append({
+                        'source_id': section_map[ref['source']],
+                        'target_id': table_id,
+                        'type': 'REFERENCES',
+                        'properties': {'context': ref['context'][:200]}
+                    })
 
         # Create parent-child relationships for hierarchy
         for i, section in enumerate(self.sections):
@@ -418,8 +628,8 @@ class OBCStructuredReader:
 # For compatibility with existing code
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract text preserving some structure"""
-    reader = OBCStructuredReader(pdf_path)
-    data = reader.read()
+    with OBCStructuredReader(pdf_path) as reader:
+        reader.read()
 
     # Format as readable text
     output = []
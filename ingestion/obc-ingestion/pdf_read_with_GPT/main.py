@@ -4,9 +4,11 @@ Reads PDF from pdf_read_with_GPT/data/
 Outputs enriched JSON to ingestion/data/
 """
 
+import asyncio
+import hashlib
 import logging
-import json
 import os
+import orjson
 import sys
 from pathlib import Path
 from typing import Optional
@@ -14,7 +16,12 @@ from dotenv import load_dotenv
 
 # Import local modules (stages 1 and 2 don't depend on ingestion.shared)
 from stage1_extraction import Stage1Extractor
-from stage2_enrichment import Stage2Enrichment
+from stage2_enrichment import (
+    MAX_CONCURRENT_REQUESTS,
+    REQUESTS_PER_MINUTE,
+    TOKENS_PER_MINUTE,
+    Stage2Enrichment
+)
 
 # Add root ingestion directory to path for imports BEFORE stage3 import
 sys.path.insert(0, str(Path(__file__).parents[3]))
@@ -50,7 +57,29 @@ def get_pdf_path(input_dir: str = "data") -> Optional[str]:
     return str(pdf_files[0])
 
 
-def main():
+def write_json_if_changed(path: Path, data) -> bool:
+    """
+    Write data as JSON unless the existing file already holds the same content.
+
+    A sidecar `.sig` file stores the hash of the last bytes written.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    sig = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    sig_path = path.with_suffix('.sig')
+
+    if path.exists() and sig_path.exists() and sig_path.read_text() == sig:
+        logger.info(f"{path.name} unchanged, skipping write")
+        return False
+
+    path.write_bytes(encoded)
+    sig_path.write_text(sig)
+    return True
+
+
+async def _main():
     """Run the complete pipeline"""
 
     # Load environment variables
@@ -78,13 +107,14 @@ def main():
         logger.info("STAGE 1: LOCAL EXTRACTION")
         logger.info("=" * 60)
 
+        # extract() reuses its own cache (keyed by PDF digest and
+        # CACHE_VERSION) when the PDF hasn't changed
         extractor = Stage1Extractor(pdf_path)
         extracted_data = extractor.extract()
 
         # Save stage 1 output for reference
         stage1_output = output_path / "stage1_extracted.json"
-        with open(stage1_output, 'w', encoding='utf-8') as f:
-            json.dump(extracted_data, f, indent=2, ensure_ascii=False)
+        write_json_if_changed(stage1_output, extracted_data)
         logger.info(f"Stage 1 output saved to: {stage1_output}")
 
         # ===== STAGE 2: SEMANTIC ENRICHMENT =====
@@ -100,8 +130,17 @@ def main():
             logger.warning("Skipping Stage 2 enrichment, saving Stage 1 output only")
             enriched_data = extracted_data
         else:
-            enricher = Stage2Enrichment(api_key=api_key)
-            enriched_data = enricher.enrich(pdf_path, extracted_data)
+            enricher = Stage2Enrichment(
+                api_key=api_key,
+                max_concurrency=int(os.getenv('OPENAI_MAX_CONCURRENCY', MAX_CONCURRENT_REQUESTS)),
+                requests_per_minute=int(os.getenv('OPENAI_RPM', REQUESTS_PER_MINUTE)),
+                tokens_per_minute=int(os.getenv('OPENAI_TPM', TOKENS_PER_MINUTE))
+            )
+            if os.getenv('OPENAI_BATCH', '').lower() in ('1', 'true', 'yes'):
+                # Half-price Batch API; results can take up to 24h
+                enriched_data = await enricher.enrich_batch_async(pdf_path, extracted_data)
+            else:
+                enriched_data = await enricher.enrich_async(pdf_path, extracted_data)
 
         # ===== SAVE FINAL OUTPUT =====
         logger.info("")
@@ -110,8 +149,7 @@ def main():
         logger.info("=" * 60)
 
         output_file = output_path / "obc_enriched.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(enriched_data, f, indent=2, ensure_ascii=False)
+        write_json_if_changed(output_file, enriched_data)
 
         logger.info(f"Final output saved to: {output_file}")
         logger.info(f"  - {enriched_data['metadata']['total_sections']} sections")
@@ -120,8 +158,7 @@ def main():
 
         # Save metadata
         metadata_file = output_path / "obc_metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(enriched_data['metadata'], f, indent=2)
+        write_json_if_changed(metadata_file, enriched_data['metadata'])
 
         # ===== STAGE 3: NEO4J INGESTION =====
         logger.info("")
@@ -138,8 +175,7 @@ def main():
 
             # Save ingestion stats
             stats_file = output_path / "ingestion_stats.json"
-            with open(stats_file, 'w', encoding='utf-8') as f:
-                json.dump(ingestion_stats, f, indent=2)
+            write_json_if_changed(stats_file, ingestion_stats)
 
             logger.info(f"Ingestion completed:")
             logger.info(f"  - Nodes created: {ingestion_stats.get('nodes_created', 0)}")
@@ -166,6 +202,11 @@ def main():
         return False
 
 
+def main():
+    """Run the complete pipeline on an asyncio event loop"""
+    return asyncio.run(_main())
+
+
 if __name__ == "__main__":
     success = main()
     sys.exit(0 if success else 1)
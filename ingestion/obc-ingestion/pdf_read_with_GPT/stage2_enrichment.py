@@ -3,33 +3,295 @@ Stage 2: Semantic enrichment with OpenAI Vision API
 Takes extracted structure + PDF pages, enriches with semantic understanding
 """
 
-import base64
+import asyncio
+try:
+    # SIMD (AVX2/NEON) base64 with the same API as the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+import functools
+import hashlib
 import logging
-import json
-from typing import Dict, List, Any
+import orjson
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 import os
 import pdf2image
+try:
+    # PyMuPDF rasterizes in-process, without Poppler subprocesses or PPM files
+    import fitz
+except ImportError:
+    fitz = None
 from PIL import Image
 import io
-import time
+try:
+    # OpenCV's libjpeg-turbo encoder is several times faster than PIL's
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential
+)
 
 logger = logging.getLogger(__name__)
 
+# Default number of Vision API requests kept in flight at once
+MAX_CONCURRENT_REQUESTS = 10
+
+# Account rate limits the request scheduler stays under
+REQUESTS_PER_MINUTE = 500
+TOKENS_PER_MINUTE = 30000
+
+# Rough token cost of one image sent to the Vision API, by detail level
+IMAGE_TOKEN_ESTIMATES = {"low": 85, "high": 765}
+
+# Images are downscaled to fit within this many pixels before encoding. A
+# 150 DPI page is ~1275x1650; "high" detail scales to 768 px on the short side
+# anyway and "low" to a single 512 px tile, so larger uploads only cost bytes
+MAX_IMAGE_DIMENSION = 1024
+
+# Resolution pages are rendered at for the Vision API
+RENDER_DPI = 150
+
+# Rendered pages kept in memory by PageRenderer
+PAGE_CACHE_SIZE = 32
+
+# JPEG quality for images sent to the Vision API; far smaller and faster to
+# encode than PNG with no noticeable loss for page scans
+JPEG_QUALITY = 85
+
+# Items packed into a single Vision API request
+SECTION_BATCH_SIZE = 15
+IMAGE_BATCH_SIZE = 10
+
+# Attempts per Vision API request before giving up on transient errors
+MAX_ATTEMPTS = 3
+
+# API responses are cached here keyed by (model, prompt, image) so reruns skip
+# requests that were already answered
+RESPONSE_CACHE_DIR = Path.home() / ".cache" / "obc_enrichment"
+
+# Structured output schemas; the API guarantees replies that parse and match
+SECTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "section_enrichment",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "sections": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer"},
+                            "section_number": {"type": "string"},
+                            "semantic_type": {
+                                "type": "string",
+                                "enum": ["requirement", "definition", "guideline", "note", "reference"]
+                            },
+                            "related_sections": {"type": "array", "items": {"type": "string"}},
+                            "key_concepts": {"type": "array", "items": {"type": "string"}},
+                            "compliance_focus": {"type": "string"}
+                        },
+                        "required": [
+                            "index", "section_number", "semantic_type",
+                            "related_sections", "key_concepts", "compliance_focus"
+                        ],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["sections"],
+            "additionalProperties": False
+        }
+    }
+}
+
+IMAGE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "image_descriptions",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "descriptions": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["descriptions"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Batch API job settings (see Stage2Enrichment.enrich_batch). Jobs are split
+# to stay under the API's per-file request and size limits
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL = 60
+BATCH_MAX_REQUESTS = 50000
+BATCH_MAX_BYTES = 190 * 1024 * 1024
+
+
+class _DeferredRequest(Exception):
+    """Raised instead of sending a request while collecting requests for a batch job"""
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    """True for API errors worth retrying: rate limits, timeouts, connection and 5xx errors"""
+    if type(exc).__name__ in (
+        'RateLimitError', 'APITimeoutError', 'APIConnectionError', 'InternalServerError'
+    ):
+        return True
+
+    status = getattr(exc, 'status_code', None)
+    if status is not None and (status in (408, 409, 429) or status >= 500):
+        return True
+
+    message = str(exc).lower()
+    return 'rate limit' in message or 'quota' in message
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket limiter for requests per minute and tokens per minute.
+
+    Both buckets refill continuously up to one minute's worth. acquire() returns
+    immediately while there is budget and sleeps only as long as needed to
+    refill it; waiters are served in arrival order.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.rps = requests_per_minute / 60
+        self.tps = tokens_per_minute / 60
+        self.max_requests = requests_per_minute
+        self.max_tokens = tokens_per_minute
+        self.requests = float(requests_per_minute)
+        self.tokens = float(tokens_per_minute)
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.requests = min(self.max_requests, self.requests + elapsed * self.rps)
+        self.tokens = min(self.max_tokens, self.tokens + elapsed * self.tps)
+
+    async def acquire(self, est_tokens: int):
+        """Wait until one request and est_tokens tokens are available, then take them"""
+        est_tokens = min(est_tokens, self.max_tokens)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.requests >= 1 and self.tokens >= est_tokens:
+                    self.requests -= 1
+                    self.tokens -= est_tokens
+                    return
+
+                await asyncio.sleep(max(
+                    (1 - self.requests) / self.rps,
+                    (est_tokens - self.tokens) / self.tps
+                ))
+
+
+class PageRenderer:
+    """
+    Renders PDF pages on demand (1-based page numbers), keeping the most
+    recently used PAGE_CACHE_SIZE pages in memory.
+    """
+
+    def __init__(self, pdf_path: str, cache_size: int = PAGE_CACHE_SIZE):
+        self.pdf_path = pdf_path
+        self._doc = None
+        self.page_count = 0
+        self.get = functools.lru_cache(maxsize=cache_size)(self._render)
+
+        try:
+            if fitz is not None:
+                self._doc = fitz.open(pdf_path)
+                self.page_count = self._doc.page_count
+            else:
+                self.page_count = pdf2image.pdfinfo_from_path(pdf_path)['Pages']
+        except Exception as e:
+            logger.error(f"Failed to open PDF for rendering: {e}")
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Release the document and cached pages"""
+        self.get.cache_clear()
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def _render(self, page_num: int) -> Image.Image:
+        """Rasterize one page to an RGB PIL image"""
+        if self._doc is not None:
+            pix = self._doc[page_num - 1].get_pixmap(dpi=RENDER_DPI, alpha=False)
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+        # Have Poppler emit JPEG rather than raw PPM: a fraction of the bytes
+        # to pipe back and parse, in the format the page is sent in anyway
+        return pdf2image.convert_from_path(
+            self.pdf_path,
+            dpi=RENDER_DPI,
+            first_page=page_num,
+            last_page=page_num,
+            fmt="jpeg",
+            jpegopt={"quality": JPEG_QUALITY, "optimize": False, "progressive": False}
+        )[0]
+
 
 class Stage2Enrichment:
     """Enrich extracted data with OpenAI Vision API"""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o",
+        cache_dir: Optional[str] = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        requests_per_minute: int = REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = TOKENS_PER_MINUTE
+    ):
         self.api_key = api_key
         self.model = model
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.cache_dir = Path(cache_dir) if cache_dir else RESPONSE_CACHE_DIR
         self.client = self._init_client()
+        self._semaphore = None
+        self._rate_limiter = None
+        # Encodings shared by requests for the same page or crop; bounded like
+        # PageRenderer's cache, so memory does not grow with the page count
+        self._page_b64: Dict[int, asyncio.Future] = OrderedDict()
+        self._crop_b64: Dict[tuple, asyncio.Future] = OrderedDict()
+        self._render_executor = None
+        self._batch_requests: Optional[Dict[str, Dict]] = None
 
     def _init_client(self):
         """Initialize OpenAI client"""
         try:
-            from openai import OpenAI
-            return OpenAI(api_key=self.api_key)
+            from openai import AsyncOpenAI
+            # Retries are handled by _create_completion
+            return AsyncOpenAI(api_key=self.api_key, max_retries=0)
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
             return None
@@ -38,6 +300,22 @@ class Stage2Enrichment:
         """
         Enrich extracted data with semantic understanding from Vision API
 
+        Runs enrich_async() on a new event loop; from async code, await
+        enrich_async() instead.
+
+        Args:
+            pdf_path: Path to original PDF
+            extracted_data: Output from Stage1Extractor.extract()
+
+        Returns:
+            Enriched data with semantic annotations
+        """
+        return asyncio.run(self.enrich_async(pdf_path, extracted_data))
+
+    async def enrich_async(self, pdf_path: str, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Enrich extracted data with semantic understanding from Vision API
+
         Args:
             pdf_path: Path to original PDF
             extracted_data: Output from Stage1Extractor.extract()
@@ -51,28 +329,39 @@ class Stage2Enrichment:
             logger.error("OpenAI client not initialized")
             return extracted_data
 
-        try:
-            # Convert PDF to images
-            pdf_images = self._pdf_to_images(pdf_path)
-            logger.info(f"Converted PDF to {len(pdf_images)} page images")
-
-            # Enrich sections with visual context
-            enriched_sections = self._enrich_sections(
-                extracted_data['sections'],
-                pdf_images,
-                extracted_data.get('references', [])
-            )
-
-            # Enrich tables with semantic meaning
-            enriched_tables = self._enrich_tables(
-                extracted_data['tables'],
-                pdf_images
-            )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_limiter = AsyncRateLimiter(self.requests_per_minute, self.tokens_per_minute)
+        self._page_b64 = OrderedDict()
+        self._crop_b64 = OrderedDict()
+        # Rendering and encoding run on their own thread so they overlap with
+        # requests in flight instead of stalling the event loop
+        self._render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-render")
+        pages = None
 
-            # Generate image descriptions
-            image_descriptions = self._describe_images(
-                extracted_data['images'],
-                pdf_images
+        try:
+            # Pages are rendered lazily as requests need them
+            pages = PageRenderer(pdf_path)
+            logger.info(f"Rendering from {len(pages)} PDF pages on demand")
+
+            # Enrich sections, tables and images concurrently; requests from all
+            # three share the same concurrency limit
+            enriched_sections, enriched_tables, image_descriptions = await asyncio.gather(
+                # Enrich sections with visual context
+                self._enrich_sections(
+                    extracted_data['sections'],
+                    pages,
+                    extracted_data.get('references', [])
+                ),
+                # Enrich tables with semantic meaning
+                self._enrich_tables(
+                    extracted_data['tables'],
+                    pages
+                ),
+                # Generate image descriptions
+                self._describe_images(
+                    extracted_data['images'],
+                    pages
+                )
             )
 
             enriched_data = {
@@ -94,152 +383,434 @@ class Stage2Enrichment:
             logger.error(f"Enrichment failed: {e}")
             return extracted_data
 
-    def _pdf_to_images(self, pdf_path: str) -> List[Image.Image]:
-        """Convert PDF pages to images"""
+        finally:
+            self._render_executor.shutdown(wait=True)
+            if pages is not None:
+                pages.close()
+
+    def enrich_batch(self, pdf_path: str, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Enrich through the OpenAI Batch API instead of live requests.
+
+        Runs enrich_batch_async() on a new event loop; from async code,
+        await enrich_batch_async() instead.
+        """
+        return asyncio.run(self.enrich_batch_async(pdf_path, extracted_data))
+
+    async def enrich_batch_async(self, pdf_path: str, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Enrich through the OpenAI Batch API instead of live requests.
+
+        Batch jobs cost half as much and are not subject to the per-minute
+        rate limits, but results can take up to BATCH_COMPLETION_WINDOW, so
+        this suits unattended bulk runs.
+
+        A first pass over the document queues every request not already in
+        the response cache; they are submitted as batch jobs, and the replies
+        are written to the response cache once the jobs finish. The final
+        enrich_async() pass is then served from the cache. Any request the batch
+        failed to answer is sent live in that pass.
+        """
+        if not self.client:
+            logger.error("OpenAI client not initialized")
+            return extracted_data
+
+        logger.info("Stage 2: Collecting requests for the Batch API")
+        self._batch_requests = {}
         try:
-            images = pdf2image.convert_from_path(pdf_path, dpi=150)
-            return images
-        except Exception as e:
-            logger.error(f"Failed to convert PDF to images: {e}")
-            return []
+            await self.enrich_async(pdf_path, extracted_data)
+            requests = self._batch_requests
+        finally:
+            self._batch_requests = None
+
+        if requests:
+            try:
+                await self._run_batches(requests)
+            except Exception as e:
+                logger.error(f"Batch enrichment failed: {e}")
+        else:
+            logger.info("All requests already cached, nothing to submit")
+
+        return await self.enrich_async(pdf_path, extracted_data)
+
+    async def _run_batches(self, requests: Dict[str, Dict]):
+        """Submit requests (cache key -> request body) as batch jobs and wait for all of them"""
+        chunks = [[]]
+        size = 0
+        for key, body in requests.items():
+            line = orjson.dumps({
+                "custom_id": key,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }) + b"\n"
+            if chunks[-1] and (len(chunks[-1]) >= BATCH_MAX_REQUESTS or size + len(line) > BATCH_MAX_BYTES):
+                chunks.append([])
+                size = 0
+            chunks[-1].append(line)
+            size += len(line)
+
+        await asyncio.gather(*(self._run_batch(lines) for lines in chunks))
+
+    async def _run_batch(self, lines: List[bytes]):
+        """Run one batch job from its JSONL input lines and write its replies to the response cache"""
+        input_file = await self.client.files.create(
+            file=("obc_enrichment.jsonl", b"".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        logger.info(f"Submitted batch {batch.id} ({len(lines)} requests)")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        logger.info(f"Batch {batch.id} {batch.status}")
+        # Expired and cancelled jobs still return whatever they finished
+        if not batch.output_file_id:
+            return
+
+        output = await self.client.files.content(batch.output_file_id)
+        answered = 0
+        for line in output.text.splitlines():
+            result = orjson.loads(line)
+            response = result.get('response') or {}
+            if response.get('status_code') != 200:
+                continue
+            text = response['body']['choices'][0]['message']['content']
+            self._store_response(self.cache_dir / f"{result['custom_id']}.txt", text)
+            answered += 1
+
+        logger.info(f"Batch {batch.id}: cached {answered} replies")
 
     def _image_to_base64(self, image: Image.Image) -> str:
-        """Convert PIL Image to base64 for API"""
+        """Convert PIL Image to base64 JPEG for API, downscaled to MAX_IMAGE_DIMENSION"""
         try:
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+
+            width, height = image.size
+            scale = MAX_IMAGE_DIMENSION / max(width, height)
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+            if cv2 is not None:
+                arr = np.asarray(image)
+                if scale < 1:
+                    arr = cv2.resize(arr, size, interpolation=cv2.INTER_AREA)
+                if arr.ndim == 3:
+                    arr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+                ok, buf = cv2.imencode(".jpg", arr, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+                if ok:
+                    return base64.b64encode(buf).decode()
+
+            if scale < 1:
+                # resize() returns a copy; rendered pages are shared through
+                # the PageRenderer cache and must not be modified
+                image = image.resize(size, Image.LANCZOS)
             buffered = io.BytesIO()
-            image.save(buffered, format="PNG")
+            image.save(buffered, format="JPEG", quality=JPEG_QUALITY, optimize=False)
             return base64.b64encode(buffered.getvalue()).decode()
         except Exception as e:
             logger.error(f"Failed to encode image: {e}")
             return ""
 
-    def _enrich_sections(
+    def _shared_encoding(self, cache: OrderedDict, key, encode) -> asyncio.Future:
+        """
+        Future for encode() run on the render thread, shared by every caller
+        with the same key while it stays among the PAGE_CACHE_SIZE most
+        recently used keys. Evicted futures stay valid for callers already
+        awaiting them.
+        """
+        future = cache.get(key)
+        if future is not None:
+            cache.move_to_end(key)
+            return future
+
+        future = cache[key] = asyncio.get_running_loop().run_in_executor(
+            self._render_executor, encode
+        )
+        while len(cache) > PAGE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return future
+
+    async def _page_base64(self, pages: PageRenderer, page_num: int) -> str:
+        """
+        Base64 of a page image, rendered and encoded once on the render thread;
+        items on the same page requested close together await the same result.
+        """
+        return await self._shared_encoding(
+            self._page_b64, page_num, lambda: self._image_to_base64(pages.get(page_num))
+        )
+
+    async def _call_vision(
+        self,
+        images_b64: List[str],
+        prompt: str,
+        max_tokens: int,
+        response_format: Optional[Dict] = None,
+        detail: str = "low"
+    ) -> str:
+        """
+        Send base64 images + prompt to the Vision API and return the reply text,
+        constrained to response_format when given. detail is the image
+        detail level: "low" for reading page layout and text, "high" for
+        diagrams.
+
+        At most max_concurrency calls are in flight at once, each call waits
+        for rate-limit budget before it is sent, and replies are cached on
+        disk so unchanged requests are not re-sent on reruns.
+        """
+        async with self._semaphore:
+            body = self._completion_body(images_b64, prompt, max_tokens, response_format, detail)
+            key = hashlib.blake2b(orjson.dumps(body, option=orjson.OPT_SORT_KEYS), digest_size=16)
+            cache_path = self.cache_dir / f"{key.hexdigest()}.txt"
+
+            if cache_path.exists():
+                return cache_path.read_text(encoding='utf-8')
+
+            if self._batch_requests is not None:
+                # Collecting for enrich_batch: queue the request under its
+                # cache key, which the batch results are written back to
+                self._batch_requests[key.hexdigest()] = body
+                raise _DeferredRequest(key.hexdigest())
+
+            # Prompt tokens (~4 chars each) + images + the reply budget
+            text = await self._create_completion(
+                body,
+                len(prompt) // 4 + IMAGE_TOKEN_ESTIMATES[detail] * len(images_b64) + max_tokens
+            )
+            self._store_response(cache_path, text)
+            return text
+
+    def _store_response(self, cache_path: Path, text: str):
+        """Write a reply to the response cache"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(text, encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"Could not cache response: {e}")
+
+    def _completion_body(
+        self,
+        images_b64: List[str],
+        prompt: str,
+        max_tokens: int,
+        response_format: Optional[Dict] = None,
+        detail: str = "low"
+    ) -> Dict:
+        """Chat completions request body for base64 images + prompt"""
+        content = [
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:image/jpeg;base64,{image_b64}",
+                    "detail": detail
+                }
+            }
+            for image_b64 in images_b64
+        ]
+        content.append({
+            "type": "text",
+            "text": prompt
+        })
+
+        body = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": content
+                }
+            ],
+            "max_tokens": max_tokens
+        }
+        if response_format is not None:
+            body["response_format"] = response_format
+        return body
+
+    @retry(
+        retry=retry_if_exception(_is_transient_error),
+        wait=wait_random_exponential(min=1, max=30),
+        stop=stop_after_attempt(MAX_ATTEMPTS),
+        reraise=True
+    )
+    async def _create_completion(self, body: Dict, est_tokens: int) -> str:
+        """Make one rate-limited Vision API request, retrying transient failures with backoff"""
+        await self._rate_limiter.acquire(est_tokens)
+
+        response = await self.client.chat.completions.create(**body)
+        return response.choices[0].message.content
+
+    async def _enrich_sections(
         self,
         sections: List[Dict],
-        pdf_images: List[Image.Image],
+        pages: PageRenderer,
         references: List[Dict]
     ) -> List[Dict]:
-        """Enrich sections with semantic tags and context"""
-        enriched = []
+        """
+        Enrich sections with semantic tags and context, SECTION_BATCH_SIZE per request.
 
-        for section in sections:
-            page_num = section['page']
+        Results are memoized per section content (see _section_key): cached
+        sections are not sent again, and duplicates within a run are sent once.
+        """
+        enriched = [None] * len(sections)
+        pending: Dict[str, List[int]] = {}
 
-            if page_num > len(pdf_images):
-                enriched.append({**section, 'semantic_tags': [], 'relationships': []})
+        for idx, section in enumerate(sections):
+            if section['page'] > len(pages):
+                enriched[idx] = {**section, 'semantic_tags': [], 'relationships': []}
                 continue
 
-            # Get the page image for context
-            page_image = pdf_images[page_num - 1]
-            image_b64 = self._image_to_base64(page_image)
+            key = self._section_key(section)
+            semantic_info = self._load_semantic_info(key)
+            if semantic_info is not None:
+                enriched[idx] = self._apply_semantic_info(section, semantic_info)
+            else:
+                pending.setdefault(key, []).append(idx)
+
+        keys = list(pending)
+        batches = [
+            keys[i:i + SECTION_BATCH_SIZE]
+            for i in range(0, len(keys), SECTION_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(
+            self._enrich_section_batch([sections[pending[key][0]] for key in batch], pages)
+            for batch in batches
+        ))
+        for batch, batch_results in zip(batches, results):
+            for key, semantic_info in zip(batch, batch_results):
+                if semantic_info:
+                    self._store_semantic_info(key, semantic_info)
+                for idx in pending[key]:
+                    enriched[idx] = self._apply_semantic_info(sections[idx], semantic_info)
 
-            try:
-                # Ask Claude to understand this section's semantic meaning
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{image_b64}"
-                                    }
-                                },
-                                {
-                                    "type": "text",
-                                    "text": f"""Analyze this section from the Ontario Building Code:
-
-Section {section['number']}: {section['title']}
-
-Content: {section['content'][:500]}
-
-Based on the visual context and content, identify:
+        logger.info(f"Enriched {len(enriched)} sections")
+        return enriched
+
+    def _section_key(self, section: Dict) -> str:
+        """Memoization key for a section's semantic info: model, page and content"""
+        key = hashlib.blake2b(digest_size=16)
+        for part in (self.model, str(section['page']), section['content'][:500]):
+            key.update(part.encode())
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def _load_semantic_info(self, key: str) -> Optional[Dict]:
+        """Semantic info previously stored under key, if any"""
+        path = self.cache_dir / "sections" / f"{key}.json"
+        if not path.exists():
+            return None
+        try:
+            return orjson.loads(path.read_bytes())
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable section cache {path}: {e}")
+            return None
+
+    def _store_semantic_info(self, key: str, semantic_info: Dict):
+        """Persist semantic info under key"""
+        path = self.cache_dir / "sections" / f"{key}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(orjson.dumps(semantic_info))
+        except OSError as e:
+            logger.debug(f"Could not cache section info: {e}")
+
+    @staticmethod
+    def _apply_semantic_info(section: Dict, semantic_info: Optional[Dict]) -> Dict:
+        """
+        Merge semantic info into a section. None marks a failed request and
+        gives the unenriched fallback.
+        """
+        if semantic_info is None:
+            return {**section, 'semantic_tags': [], 'relationships': []}
+
+        return {
+            **section,
+            'semantic_type': semantic_info.get('semantic_type', 'unknown'),
+            'related_sections': semantic_info.get('related_sections', []),
+            'key_concepts': semantic_info.get('key_concepts', []),
+            'compliance_focus': semantic_info.get('compliance_focus', '')
+        }
+
+    async def _enrich_section_batch(self, sections: List[Dict], pages: PageRenderer) -> List[Optional[Dict]]:
+        """
+        Enrich a batch of sections with one request carrying each distinct page image once.
+
+        Returns:
+            Semantic info per section: {} when the reply omitted it, and None
+            for every section when the request failed
+        """
+        page_nums = sorted({section['page'] for section in sections})
+        listing = "\n\n".join(
+            f"[{i}] Section {section['number']}: {section['title']} (page {section['page']})\n"
+            f"Content: {section['content'][:500]}"
+            for i, section in enumerate(sections, 1)
+        )
+
+        try:
+            # Ask Claude to understand each section's semantic meaning
+            response_text = await self._call_vision(
+                await asyncio.gather(*(self._page_base64(pages, page) for page in page_nums)),
+                f"""Analyze these {len(sections)} sections from the Ontario Building Code.
+The attached images are, in order, pages {', '.join(map(str, page_nums))}.
+
+{listing}
+
+For each section, based on the visual context and content, identify:
 1. semantic_type: Is this a requirement, definition, guideline, note, or reference?
 2. related_sections: What other sections does this relate to?
 3. key_concepts: What are the main building code concepts?
 4. compliance_focus: What does the builder/designer need to comply with?
 
-Return as JSON:
-{{
-    "semantic_type": "requirement|definition|guideline|note|reference",
-    "related_sections": ["6.1.1", "6.2"],
-    "key_concepts": ["structural", "fire safety"],
-    "compliance_focus": "description"
-}}"""
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=500
-                )
+Return one entry in "sections" per section, using the [index] shown above.""",
+                max_tokens=500 * len(sections),
+                response_format=SECTION_RESPONSE_FORMAT
+            )
 
-                # Parse response
-                response_text = response.choices[0].message.content
-                try:
-                    semantic_info = json.loads(response_text)
-                except:
-                    # Try to extract JSON from response
-                    import re
-                    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                    semantic_info = json.loads(json_match.group(0)) if json_match else {}
-
-                enriched.append({
-                    **section,
-                    'semantic_type': semantic_info.get('semantic_type', 'unknown'),
-                    'related_sections': semantic_info.get('related_sections', []),
-                    'key_concepts': semantic_info.get('key_concepts', []),
-                    'compliance_focus': semantic_info.get('compliance_focus', '')
-                })
-
-                # Rate limit to avoid hitting API limits
-                time.sleep(0.5)
+            by_index = {
+                item['index']: item for item in orjson.loads(response_text)['sections']
+            }
 
-            except Exception as e:
-                logger.warning(f"Failed to enrich section {section['number']}: {e}")
-                enriched.append({**section, 'semantic_tags': [], 'relationships': []})
+        except Exception as e:
+            if not isinstance(e, _DeferredRequest):
+                logger.warning(
+                    f"Failed to enrich sections {sections[0]['number']}..{sections[-1]['number']}: {e}"
+                )
+            return [None] * len(sections)
 
-        logger.info(f"Enriched {len(enriched)} sections")
-        return enriched
+        return [by_index.get(i, {}) for i in range(1, len(sections) + 1)]
 
-    def _enrich_tables(
+    async def _enrich_tables(
         self,
         tables: List[Dict],
-        pdf_images: List[Image.Image]
+        pages: PageRenderer
     ) -> List[Dict]:
         """Enrich tables with semantic understanding"""
-        enriched = []
+        enriched = await asyncio.gather(
+            *(self._enrich_table(table, pages) for table in tables)
+        )
 
-        for table in tables:
-            page_num = table['page']
+        logger.info(f"Enriched {len(enriched)} tables")
+        return list(enriched)
 
-            if page_num > len(pdf_images):
-                enriched.append({**table, 'semantic_meaning': '', 'row_interpretations': []})
-                continue
+    async def _enrich_table(self, table: Dict, pages: PageRenderer) -> Dict:
+        """Enrich a single table"""
+        page_num = table['page']
 
-            page_image = pdf_images[page_num - 1]
-            image_b64 = self._image_to_base64(page_image)
+        if page_num > len(pages):
+            return {**table, 'semantic_meaning': '', 'row_interpretations': []}
 
-            try:
-                # Ask Claude about table meaning
-                table_summary = str(table['rows'][:5])  # First 5 rows for context
-
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{image_b64}"
-                                    }
-                                },
-                                {
-                                    "type": "text",
-                                    "text": f"""Analyze this table from the Ontario Building Code (page {page_num}):
+        try:
+            # Ask Claude about table meaning
+            table_summary = str(table['rows'][:5])  # First 5 rows for context
+
+            meaning = await self._call_vision(
+                [await self._page_base64(pages, page_num)],
+                f"""Analyze this table from the Ontario Building Code (page {page_num}):
 
 Table: {table['name']}
 Headers: {', '.join(table['headers'])}
@@ -250,102 +821,116 @@ Explain:
 2. How would a builder/designer use this table?
 3. What are the key decisions or classifications?
 
-Keep response concise (2-3 sentences)."""
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=300
-                )
-
-                meaning = response.choices[0].message.content
-
-                enriched.append({
-                    **table,
-                    'semantic_meaning': meaning
-                })
+Keep response concise (2-3 sentences).""",
+                max_tokens=300
+            )
 
-                time.sleep(0.5)
+            return {
+                **table,
+                'semantic_meaning': meaning
+            }
 
-            except Exception as e:
+        except Exception as e:
+            if not isinstance(e, _DeferredRequest):
                 logger.warning(f"Failed to enrich table {table['name']}: {e}")
-                enriched.append({**table, 'semantic_meaning': ''})
-
-        logger.info(f"Enriched {len(enriched)} tables")
-        return enriched
+            return {**table, 'semantic_meaning': ''}
 
-    def _describe_images(
+    async def _describe_images(
         self,
         images: List[Dict],
-        pdf_images: List[Image.Image]
+        pages: PageRenderer
     ) -> List[Dict]:
-        """Generate descriptions for extracted images"""
-        descriptions = []
-
-        for img_ref in images:
-            page_num = img_ref['page']
-
-            if page_num > len(pdf_images):
-                descriptions.append({**img_ref, 'description': 'Image unavailable'})
-                continue
-
-            page_image = pdf_images[page_num - 1]
-
-            # Crop to image bbox if available
-            if 'bbox' in img_ref:
-                bbox = img_ref['bbox']
-                width, height = page_image.size
-                # Normalize bbox coordinates
-                left = int(bbox['x0'] * width / 72) if bbox['x0'] < 100 else int(bbox['x0'])
-                top = int(bbox['y0'] * height / 72) if bbox['y0'] < 100 else int(bbox['y0'])
-                right = int(bbox['x1'] * width / 72) if bbox['x1'] < 100 else int(bbox['x1'])
-                bottom = int(bbox['y1'] * height / 72) if bbox['y1'] < 100 else int(bbox['y1'])
-
-                try:
-                    cropped = page_image.crop((left, top, right, bottom))
-                except:
-                    cropped = page_image
+        """Generate descriptions for extracted images, IMAGE_BATCH_SIZE per request"""
+        descriptions = [None] * len(images)
+        batchable = []
 
+        for idx, img_ref in enumerate(images):
+            if img_ref['page'] > len(pages):
+                descriptions[idx] = {**img_ref, 'description': 'Image unavailable'}
             else:
-                cropped = page_image
+                batchable.append(idx)
+
+        batches = [
+            batchable[i:i + IMAGE_BATCH_SIZE]
+            for i in range(0, len(batchable), IMAGE_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(
+            self._describe_image_batch([images[idx] for idx in batch], pages)
+            for batch in batches
+        ))
+        for batch, batch_results in zip(batches, results):
+            for idx, result in zip(batch, batch_results):
+                descriptions[idx] = result
 
-            image_b64 = self._image_to_base64(cropped)
+        logger.info(f"Generated {len(descriptions)} image descriptions")
+        return descriptions
 
-            try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{image_b64}"
-                                    }
-                                },
-                                {
-                                    "type": "text",
-                                    "text": "Describe this diagram from the Ontario Building Code. What building code concept does it illustrate? Keep description concise (1-2 sentences)."
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=200
-                )
+    async def _image_ref_base64(self, img_ref: Dict, pages: PageRenderer) -> str:
+        """
+        Base64 of an extracted image: only its cropped region is encoded, once
+        per distinct (page, bbox). The page encoding is reused when there is
+        no bbox or the crop fails.
+        """
+        def crop_and_encode() -> Optional[str]:
+            page_image = pages.get(img_ref['page'])
+            cropped = self._crop_image(img_ref, page_image)
+            if cropped is page_image:
+                return None
+            return self._image_to_base64(cropped)
+
+        image_b64 = None
+        if 'bbox' in img_ref:
+            bbox = img_ref['bbox']
+            key = (img_ref['page'], bbox['x0'], bbox['y0'], bbox['x1'], bbox['y1'])
+            image_b64 = await self._shared_encoding(self._crop_b64, key, crop_and_encode)
+        if image_b64 is None:
+            image_b64 = await self._page_base64(pages, img_ref['page'])
+        return image_b64
+
+    def _crop_image(self, img_ref: Dict, page_image: Image.Image) -> Image.Image:
+        """Crop an extracted image's bbox out of its page image"""
+        # Crop to image bbox if available
+        if 'bbox' in img_ref:
+            bbox = img_ref['bbox']
+            width, height = page_image.size
+            # Normalize bbox coordinates
+            left = int(bbox['x0'] * width / 72) if bbox['x0'] < 100 else int(bbox['x0'])
+            top = int(bbox['y0'] * height / 72) if bbox['y0'] < 100 else int(bbox['y0'])
+            right = int(bbox['x1'] * width / 72) if bbox['x1'] < 100 else int(bbox['x1'])
+            bottom = int(bbox['y1'] * height / 72) if bbox['y1'] < 100 else int(bbox['y1'])
 
-                description = response.choices[0].message.content
+            try:
+                return page_image.crop((left, top, right, bottom))
+            except:
+                return page_image
 
-                descriptions.append({
-                    **img_ref,
-                    'description': description
-                })
+        return page_image
 
-                time.sleep(0.5)
+    async def _describe_image_batch(self, img_refs: List[Dict], pages: PageRenderer) -> List[Dict]:
+        """Describe a batch of extracted images in one request"""
+        try:
+            response_text = await self._call_vision(
+                await asyncio.gather(*(self._image_ref_base64(img_ref, pages) for img_ref in img_refs)),
+                f"""The {len(img_refs)} attached images are diagrams from the Ontario Building Code.
+For each diagram, in order, describe what building code concept it illustrates. Keep each description concise (1-2 sentences).
+
+Return {len(img_refs)} entries in "descriptions", one per image.""",
+                max_tokens=200 * len(img_refs),
+                response_format=IMAGE_RESPONSE_FORMAT,
+                detail="high"
+            )
 
-            except Exception as e:
-                logger.warning(f"Failed to describe image on page {page_num}: {e}")
-                descriptions.append({**img_ref, 'description': f'Image on page {page_num}'})
+            descriptions = orjson.loads(response_text)['descriptions']
 
-        logger.info(f"Generated {len(descriptions)} image descriptions")
-        return descriptions
+        except Exception as e:
+            if not isinstance(e, _DeferredRequest):
+                logger.warning(f"Failed to describe images on page {img_refs[0]['page']}: {e}")
+            descriptions = []
+
+        results = []
+        for i, img_ref in enumerate(img_refs):
+            if i < len(descriptions):
+                results.append({**img_ref, 'description': descriptions[i]})
+            else:
+                results.append({**img_ref, 'description': f"Image on page {img_ref['page']}"})
+        return results
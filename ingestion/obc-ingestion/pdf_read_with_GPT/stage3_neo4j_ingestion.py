@@ -12,7 +12,7 @@ Converts:
 import sys
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import json
 from dataclasses import dataclass, asdict
 
@@ -26,6 +26,9 @@ from ingestion.shared.src.core.embeddings import EmbeddingManager
 
 logger = logging.getLogger(__name__)
 
+# Rows sent per UNWIND query when flushing buffered nodes
+BATCH_SIZE = 1000
+
 
 @dataclass
 class OBCNodeData:
@@ -57,12 +60,18 @@ class Neo4jOBCIngester:
         self.graph = graph
         self.schema = create_elaws_obc_schema()
         self.embedding_manager = EmbeddingManager()
-        self.created_nodes = {}  # Maps node_id -> neo4j_internal_id
+        self._section_buffer: List[Dict[str, Any]] = []
+        self._subsection_buffer: List[Dict[str, Any]] = []
+        self._clause_buffer: List[Dict[str, Any]] = []
 
     def ingest(self, enriched_data: Dict[str, Any], document_id: str = "obc_elaws_332_12") -> Dict[str, Any]:
         """
         Main ingestion method.
 
+        Nodes are merged on their business keys (regulation_id, division_id,
+        part_number, section_number), so re-running ingestion updates the
+        existing hierarchy instead of duplicating it.
+
         Args:
             enriched_data: Output from Stage 2 enrichment
             document_id: ID for the document node
@@ -83,37 +92,47 @@ class Neo4jOBCIngester:
         }
 
         try:
+            self._create_indexes()
+
             # Step 1: Create document node
-            doc_node_id = self._create_document_node(document_id)
+            self._merge_document(document_id)
             stats["nodes_created"] += 1
 
             # Step 2: Create regulation and hierarchy
-            reg_node_id = self._create_regulation_node()
+            self._merge_regulation()
             stats["nodes_created"] += 1
 
             # Step 3: Create divisions and parts
-            div_nodes = self._create_divisions()
-            stats["nodes_created"] += len(div_nodes)
+            divisions = self._merge_divisions()
+            stats["nodes_created"] += len(divisions)
+            stats["relationships_created"] += len(divisions)
 
-            part_nodes = self._create_parts()
-            stats["nodes_created"] += len(part_nodes)
+            parts = self._merge_parts()
+            stats["nodes_created"] += len(parts)
+            stats["relationships_created"] += len(parts)
 
             # Step 4: Process sections and clauses
             sections = enriched_data.get("sections", [])
             logger.info(f"Processing {len(sections)} sections")
 
+            self._section_buffer = []
+            self._subsection_buffer = []
+            self._clause_buffer = []
+
             for section in sections:
                 try:
-                    section_nodes, section_rels = self._process_section(
-                        section, part_nodes[0]  # Assume part 3
+                    self._process_section(
+                        section, parts[0]  # Assume part 3
                     )
-                    stats["nodes_created"] += len(section_nodes)
-                    stats["relationships_created"] += len(section_rels)
                 except Exception as e:
                     error_msg = f"Error processing section {section.get('number')}: {e}"
                     logger.error(error_msg)
                     stats["errors"].append(error_msg)
 
+            nodes_created, rels_created = self._flush_buffers(stats["errors"])
+            stats["nodes_created"] += nodes_created
+            stats["relationships_created"] += rels_created
+
             logger.info(f"Ingestion complete: {stats['nodes_created']} nodes, {stats['relationships_created']} relationships")
 
         except Exception as e:
@@ -123,261 +142,195 @@ class Neo4jOBCIngester:
 
         return stats
 
-    def _create_document_node(self, document_id: str) -> str:
-        """Create a document node"""
+    def _create_indexes(self):
+        """Index the business keys the MATCH and MERGE statements look nodes up by"""
+        for name, label, prop in (
+            ("document_id_idx", "Document", "id"),
+            ("regulation_id_idx", "Regulation", "regulation_id"),
+            ("division_id_idx", "Division", "division_id"),
+            ("part_number_idx", "Part", "part_number"),
+            ("section_number_idx", "Section", "section_number"),
+            ("clause_number_idx", "Clause", "clause_number"),
+        ):
+            self.graph.execute_query(f"""
+            CREATE INDEX {name} IF NOT EXISTS
+            FOR (n:{label})
+            ON (n.{prop})
+            """)
+
+    def _merge_document(self, document_id: str):
+        """Create or update the document node"""
         query = """
-        CREATE (d:Document {
-            id: $id,
-            title: 'Ontario Building Code - E-Laws O. Reg. 332/12',
-            source: 'e-laws.pdf',
-            ingested_at: datetime()
-        })
-        RETURN id(d) as neo4j_id
+        MERGE (d:Document {id: $id})
+        SET d.title = 'Ontario Building Code - E-Laws O. Reg. 332/12',
+            d.source = 'e-laws.pdf',
+            d.ingested_at = datetime()
         """
-        result = self.graph.execute_query(query, {"id": document_id})
-        node_id = result[0]["neo4j_id"] if result else None
-        self.created_nodes["document"] = node_id
-        return node_id
+        self.graph.execute_query(query, {"id": document_id})
 
-    def _create_regulation_node(self) -> str:
-        """Create the root Regulation node"""
+    def _merge_regulation(self):
+        """Create or update the root Regulation node"""
         query = """
-        CREATE (r:Regulation {
-            regulation_id: '332/12',
-            title: 'Building Code',
-            abbreviation: 'O. Reg. 332/12',
-            source_url: 'https://www.ontario.ca/laws/regulation/120332'
-        })
-        RETURN id(r) as neo4j_id
+        MERGE (r:Regulation {regulation_id: '332/12'})
+        SET r.title = 'Building Code',
+            r.abbreviation = 'O. Reg. 332/12',
+            r.source_url = 'https://www.ontario.ca/laws/regulation/120332'
         """
-        result = self.graph.execute_query(query, {})
-        node_id = result[0]["neo4j_id"] if result else None
-        self.created_nodes["regulation"] = node_id
-        return node_id
+        self.graph.execute_query(query, {})
 
-    def _create_divisions(self) -> list:
-        """Create Division nodes"""
+    def _merge_divisions(self) -> list:
+        """Merge Division nodes and link them to the regulation in one query"""
         divisions = [
             ("A", "Compliance and Objectives"),
             ("B", "Building Occupancy")
         ]
-        created = []
-
-        for div_id, div_title in divisions:
-            query = """
-            CREATE (d:Division {
-                division_id: $div_id,
-                title: $title
-            })
-            RETURN id(d) as neo4j_id
-            """
-            result = self.graph.execute_query(query, {
-                "div_id": div_id,
-                "title": div_title
-            })
-            node_id = result[0]["neo4j_id"] if result else None
-
-            # Link to regulation
-            if node_id and self.created_nodes.get("regulation"):
-                rel_query = """
-                MATCH (r) WHERE id(r) = $reg_id
-                MATCH (d) WHERE id(d) = $div_id
-                CREATE (r)-[:HAS_DIVISION {sequence: $seq}]->(d)
-                """
-                self.graph.execute_query(rel_query, {
-                    "reg_id": self.created_nodes["regulation"],
-                    "div_id": node_id,
-                    "seq": ord(div_id) - ord('A')
-                })
-
-            self.created_nodes[f"division_{div_id}"] = node_id
-            created.append(node_id)
-
-        return created
-
-    def _create_parts(self) -> list:
-        """Create Part nodes (e.g., Part 3)"""
+
+        query = """
+        MATCH (r:Regulation {regulation_id: '332/12'})
+        UNWIND $rows AS row
+        MERGE (d:Division {division_id: row.div_id})
+        ON CREATE SET d.title = row.title
+        MERGE (r)-[:HAS_DIVISION {sequence: row.seq}]->(d)
+        """
+        self.graph.execute_query(query, {"rows": [
+            {"div_id": div_id, "title": div_title, "seq": ord(div_id) - ord('A')}
+            for div_id, div_title in divisions
+        ]})
+
+        return [div_id for div_id, _ in divisions]
+
+    def _merge_parts(self) -> list:
+        """Merge Part nodes (e.g., Part 3) and link them to Division A in one query"""
         parts = [
             ("3", "Fire Protection, Occupant Safety and Accessibility"),
             ("9", "Housing and Recreational Construction"),
             ("11", "Renovation")
         ]
-        created = []
-
-        for part_num, part_title in parts:
-            query = """
-            CREATE (p:Part {
-                part_number: $part_num,
-                title: $title,
-                sequence: $seq
-            })
-            RETURN id(p) as neo4j_id
-            """
-            result = self.graph.execute_query(query, {
-                "part_num": part_num,
-                "title": part_title,
-                "seq": int(part_num)
-            })
-            node_id = result[0]["neo4j_id"] if result else None
-
-            # Link to division A
-            if node_id and self.created_nodes.get("division_A"):
-                rel_query = """
-                MATCH (d) WHERE id(d) = $div_id
-                MATCH (p) WHERE id(p) = $part_id
-                CREATE (d)-[:HAS_PART {sequence: $seq}]->(p)
-                """
-                self.graph.execute_query(rel_query, {
-                    "div_id": self.created_nodes["division_A"],
-                    "part_id": node_id,
-                    "seq": int(part_num)
-                })
-
-            self.created_nodes[f"part_{part_num}"] = node_id
-            created.append(node_id)
-
-        return created
-
-    def _process_section(self, section: Dict[str, Any], parent_part_id: str) -> tuple:
-        """Process a section and its clauses"""
-        nodes_created = []
-        rels_created = []
-
-        section_number = section.get("number", "")
-        section_title = section.get("title", "")
 
-        # Create section node
         query = """
-        CREATE (s:Section {
-            section_number: $number,
-            title: $title,
-            sequence: $seq
-        })
-        RETURN id(s) as neo4j_id
+        MATCH (d:Division {division_id: 'A'})
+        UNWIND $rows AS row
+        MERGE (p:Part {part_number: row.part_num})
+        ON CREATE SET p.title = row.title, p.sequence = row.seq
+        MERGE (d)-[:HAS_PART {sequence: row.seq}]->(p)
         """
-        result = self.graph.execute_query(query, {
+        self.graph.execute_query(query, {"rows": [
+            {"part_num": part_num, "title": part_title, "seq": int(part_num)}
+            for part_num, part_title in parts
+        ]})
+
+        return [part_num for part_num, _ in parts]
+
+    def _process_section(self, section: Dict[str, Any], part_number: str):
+        """Buffer a section and its subsections for the batched write"""
+        section_number = section.get("number", "")
+
+        self._section_buffer.append({
+            "parent_number": part_number,
             "number": section_number,
-            "title": section_title,
+            "title": section.get("title", ""),
             "seq": self._calculate_sequence(section_number)
         })
-        section_node_id = result[0]["neo4j_id"] if result else None
-        nodes_created.append(section_node_id)
-
-        # Link section to part
-        if section_node_id and parent_part_id:
-            rel_query = """
-            MATCH (p) WHERE id(p) = $part_id
-            MATCH (s) WHERE id(s) = $section_id
-            CREATE (p)-[:HAS_SECTION {sequence: $seq}]->(s)
-            """
-            self.graph.execute_query(rel_query, {
-                "part_id": parent_part_id,
-                "section_id": section_node_id,
-                "seq": self._calculate_sequence(section_number)
-            })
-            rels_created.append(1)
 
         # Process subsections
-        subsections = section.get("subsections", [])
-        for subsection in subsections:
-            sub_nodes, sub_rels = self._process_subsection(
-                subsection, section_node_id
-            )
-            nodes_created.extend(sub_nodes)
-            rels_created.extend(sub_rels)
-
-        return nodes_created, rels_created
-
-    def _process_subsection(self, subsection: Dict[str, Any], parent_section_id: str) -> tuple:
-        """Process a subsection"""
-        nodes_created = []
-        rels_created = []
+        for subsection in section.get("subsections", []):
+            self._process_subsection(subsection, section_number)
 
+    def _process_subsection(self, subsection: Dict[str, Any], parent_section_number: str):
+        """Buffer a subsection and its clauses"""
         subsection_number = subsection.get("number", "")
-        subsection_title = subsection.get("title", "")
 
-        # Create subsection node
-        query = """
-        CREATE (ss:Section {
-            section_number: $number,
-            title: $title,
-            sequence: $seq
-        })
-        RETURN id(ss) as neo4j_id
-        """
-        result = self.graph.execute_query(query, {
+        self._subsection_buffer.append({
+            "parent_number": parent_section_number,
             "number": subsection_number,
-            "title": subsection_title,
+            "title": subsection.get("title", ""),
             "seq": self._calculate_sequence(subsection_number)
         })
-        subsection_node_id = result[0]["neo4j_id"] if result else None
-        nodes_created.append(subsection_node_id)
-
-        # Link subsection to parent section
-        if subsection_node_id and parent_section_id:
-            rel_query = """
-            MATCH (parent) WHERE id(parent) = $parent_id
-            MATCH (sub) WHERE id(sub) = $sub_id
-            CREATE (parent)-[:HAS_SECTION {sequence: $seq}]->(sub)
-            """
-            self.graph.execute_query(rel_query, {
-                "parent_id": parent_section_id,
-                "sub_id": subsection_node_id,
-                "seq": self._calculate_sequence(subsection_number)
-            })
-            rels_created.append(1)
 
         # Process clauses
-        clauses = subsection.get("clauses", [])
-        for clause_idx, clause in enumerate(clauses):
-            clause_nodes, clause_rels = self._process_clause(
-                clause, subsection_node_id, clause_idx
-            )
-            nodes_created.extend(clause_nodes)
-            rels_created.extend(clause_rels)
+        for clause_idx, clause in enumerate(subsection.get("clauses", [])):
+            self._process_clause(clause, subsection_number, clause_idx)
+
+    def _process_clause(self, clause: Dict[str, Any], parent_section_number: str, sequence: int):
+        """Buffer a clause"""
+        self._clause_buffer.append({
+            "parent_number": parent_section_number,
+            "number": clause.get("number", f"({sequence})"),
+            "text": clause.get("text", "")[:500],  # Limit text
+            "seq": sequence
+        })
 
-        return nodes_created, rels_created
+    def _flush_buffers(self, errors: List[str]) -> tuple:
+        """
+        Write the buffered sections, subsections and clauses with UNWIND batches.
 
-    def _process_clause(self, clause: Dict[str, Any], parent_section_id: str, sequence: int) -> tuple:
-        """Process a clause"""
-        nodes_created = []
-        rels_created = []
+        Each statement looks the parent up by its indexed business key and
+        merges the child and the relationship between them, so no node IDs
+        are passed around. Parents are written before their children
+        (parts, then sections, then subsections), so a plain MATCH finds
+        them without the write locks MERGE takes.
+        Clause numbers are only unique within their section, so clauses are
+        merged through the HAS_CLAUSE pattern.
 
-        clause_number = clause.get("number", f"({sequence})")
-        clause_text = clause.get("text", "")
+        A batch that fails is recorded in errors and skipped; the remaining
+        batches and levels are still written.
 
-        # Create clause node
-        query = """
-        CREATE (c:Clause {
-            clause_number: $number,
-            text: $text,
-            sequence: $seq
-        })
-        RETURN id(c) as neo4j_id
+        Returns:
+            (nodes_created, relationships_created), counting only rows
+            written under an existing parent
         """
-        result = self.graph.execute_query(query, {
-            "number": clause_number,
-            "text": clause_text[:500],  # Limit text
-            "seq": sequence
-        })
-        clause_node_id = result[0]["neo4j_id"] if result else None
-        nodes_created.append(clause_node_id)
-
-        # Link clause to section
-        if clause_node_id and parent_section_id:
-            rel_query = """
-            MATCH (s) WHERE id(s) = $section_id
-            MATCH (c) WHERE id(c) = $clause_id
-            CREATE (s)-[:HAS_CLAUSE {sequence: $seq}]->(c)
-            """
-            self.graph.execute_query(rel_query, {
-                "section_id": parent_section_id,
-                "clause_id": clause_node_id,
-                "seq": sequence
-            })
-            rels_created.append(1)
-
-        return nodes_created, rels_created
+        section_query = """
+        UNWIND $rows AS row
+        MATCH (p:Part {part_number: row.parent_number})
+        MERGE (s:Section {section_number: row.number})
+        ON CREATE SET s.title = row.title, s.sequence = row.seq
+        MERGE (p)-[:HAS_SECTION {sequence: row.seq}]->(s)
+        RETURN count(*) AS written
+        """
+        written = self._write_batched(section_query, self._section_buffer, errors)
+
+        subsection_query = """
+        UNWIND $rows AS row
+        MATCH (p:Section {section_number: row.parent_number})
+        MERGE (s:Section {section_number: row.number})
+        ON CREATE SET s.title = row.title, s.sequence = row.seq
+        MERGE (p)-[:HAS_SECTION {sequence: row.seq}]->(s)
+        RETURN count(*) AS written
+        """
+        written += self._write_batched(subsection_query, self._subsection_buffer, errors)
+
+        clause_query = """
+        UNWIND $rows AS row
+        MATCH (s:Section {section_number: row.parent_number})
+        MERGE (s)-[:HAS_CLAUSE {sequence: row.seq}]->(c:Clause {clause_number: row.number})
+        ON CREATE SET c.text = row.text, c.sequence = row.seq
+        RETURN count(*) AS written
+        """
+        written += self._write_batched(clause_query, self._clause_buffer, errors)
+
+        return written, written
+
+    def _write_batched(self, query: str, rows: List[Dict[str, Any]], errors: List[str]) -> int:
+        """
+        Run an UNWIND query over rows in chunks of BATCH_SIZE.
+
+        A failing batch is logged, recorded in errors and skipped.
+
+        Returns:
+            Total of the query's written counts over the batches that succeeded
+        """
+        written = 0
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start:start + BATCH_SIZE]
+            try:
+                result = self.graph.execute_query(query, {"rows": batch})
+            except Exception as e:
+                error_msg = f"Error writing rows {start}-{start + len(batch) - 1}: {e}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                continue
+            written += result[0]["written"] if result else 0
+        return written
 
     def _calculate_sequence(self, number_string: str) -> int:
         """Convert section number to sortable sequence"""
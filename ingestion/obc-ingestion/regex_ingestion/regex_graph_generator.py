@@ -1,8 +1,31 @@
+import functools
+import os
 import re
 import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
+import orjson
 import pdfplumber
+try:
+    # PDFium (C++) opens the document without pdfplumber's parse. Page text
+    # still comes from pdfplumber: the line classifier depends on its line
+    # layout, and PDFium's lines classify differently (wrapped references
+    # read as Article headers)
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+try:
+    # Hyperscan (SIMD automaton) finds which sentences contain a reference
+    # in one pass over all of them
+    import hyperscan
+except ImportError:
+    hyperscan = None
 from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError
 
 # Ensure project root is on sys.path when running as a script
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -20,9 +43,16 @@ NEO4J_USER = NEO4J_CONFIG["user"]
 NEO4J_PASSWORD = NEO4J_CONFIG["password"]
 NEO4J_DATABASE = NEO4J_CONFIG.get("database")
 SESSION_KWARGS = {"database": NEO4J_DATABASE} if NEO4J_DATABASE else {}
+NEO4J_POOL_SIZE = 64  # connections shared by concurrent sessions
 
 PDF_PATH = "./building_code.pdf"
 MAX_PAGES = 932  # limit ingestion to first N pages
+PAGES_PER_WORKER = 25  # minimum pages handed to each extraction worker
+PROGRESS_EVERY = 10  # pages between "Finished page" messages
+BATCH_SIZE = 1000  # rows committed per transaction
+LOAD_WORKERS = 8  # sessions loading articles concurrently
+PARSE_OUTPUT_DIR = "./parsed"  # JSONL rows written by the parse stage
+REUSE_PARSE_OUTPUT = False  # load PARSE_OUTPUT_DIR from an earlier run instead of re-parsing
 
 CODE_ID = "ON_BC_332_12"
 CODE_TITLE = "Ontario Regulation 332/12 – Building Code"
@@ -32,11 +62,35 @@ CODE_JURISDICTION = "Ontario"
 # REGEX PATTERNS (STRUCTURE)
 # ==========================
 
-division_re = re.compile(r"^DIVISION\s+([A-Z])\s*(.*)", re.IGNORECASE)
-part_re = re.compile(r"^PART\s+(\d+)\s+(.*)", re.IGNORECASE)
-section_re = re.compile(r"^Section\s+(\d+\.\d+)\.?\s*(.*)", re.IGNORECASE)
-article_re = re.compile(r"^(\d+(?:\.\d+){2,})\.\s*(.*)")
-sentence_re = re.compile(r"^\((\d+)\)\s*(.+)")
+# One alternation classifies a line in a single match; the branch that matched
+# is named by m.lastgroup. The branches start with different tokens
+# (DIVISION / PART / Section / digit / "("), so at most one can match a line.
+structure_re = re.compile(
+    r"^(?:"
+    r"(?P<division>DIVISION\s+(?P<division_letter>[A-Z])\s*(?P<division_title>.*))"
+    r"|(?P<part>PART\s+(?P<part_number>\d+)\s+(?P<part_title>.*))"
+    r"|(?P<section>Section\s+(?P<section_number>\d+\.\d+)\.?\s*(?P<section_title>.*))"
+    r"|(?P<article>(?P<article_ref>\d+(?:\.\d+){2,})\.\s*(?P<article_title>.*))"
+    r"|(?P<sentence>\((?P<sentence_number>\d+)\)\s*(?P<sentence_text>.+))"
+    r")",
+    re.IGNORECASE
+)
+
+# Characters a structure_re match can start with, besides digits (under
+# IGNORECASE, "ſ" matches "s"). Lines starting with anything else are
+# continuation text and skip the regex call.
+STRUCTURE_INITIALS = frozenset("DdPpSsſ(")
+
+# The two fields each structure_re branch captures. scan_page matches
+# stripped lines and every branch consumes the whitespace before its last
+# field, which runs to the end of the line, so the fields need no stripping.
+STRUCTURE_FIELDS = {
+    "division": ("division_letter", "division_title"),
+    "part": ("part_number", "part_title"),
+    "section": ("section_number", "section_title"),
+    "article": ("article_ref", "article_title"),
+    "sentence": ("sentence_number", "sentence_text"),
+}
 
 # ==========================
 # REGEX PATTERNS (INTERNAL REFS)
@@ -54,60 +108,192 @@ sentence_ref_re = re.compile(
 
 # Bare "1.1.3.1.(1)" – we’ll treat as a sentence ref if not already
 # preceded by "Article"/"Sentence"
-bare_sentence_ref_re = re.compile(
-    r"\b(\d+(?:\.\d+){2,})\.\((\d+)\)", re.UNICODE
+bare_sentence_ref_pattern = r"\b(\d+(?:\.\d+){2,})\.\((\d+)\)"
+
+# Fixed-width lookbehinds for "Article", "Sentence" or "Sentences" plus
+# whitespace within the 15 characters before a bare ref; Python lookbehinds
+# are fixed-width, so there is one per whitespace run length.
+bare_ref_keyword_lookbehind = "|".join(
+    rf"(?<={keyword}\s{{{n}}})"
+    for keyword, length in (("[Aa]rticle", 7), ("[Ss]entence", 8), ("[Ss]entences", 9))
+    for n in range(1, 16 - length)
+)
+
+# All three reference kinds in one alternation, so each text is scanned once;
+# m.lastgroup names the kind. The explicit branches consume only the keyword
+# and read the number through a lookahead, so the scan still reaches the
+# number and tries the bare branch there, as a separate bare pass would.
+# bare_keyword is set (to "") when a bare ref directly follows a keyword;
+# those refs are handled by the explicit branches.
+ref_re = re.compile(
+    r"(?P<article>\b[Aa]rticle\s+"
+    r"(?=(?P<article_text>(?P<article_ref>\d+(?:\.\d+){2,})\.)))"
+    r"|(?P<sentence>\b[Ss]entences?\s+"
+    r"(?=(?P<sentence_text>(?P<sentence_article>\d+(?:\.\d+){2,})\.\((?P<sentence_number>\d+)\))))"
+    r"|(?P<bare>(?P<bare_keyword>" + bare_ref_keyword_lookbehind + r")?"
+    r"\b(?P<bare_article>\d+(?:\.\d+){2,})\.\((?P<bare_number>\d+)\))",
+    re.UNICODE
+)
+
+# Server-side equivalents for apoc.text.regexGroups (Java regex; (?U) gives
+# \s, \d and \b the Unicode meaning they have in Python). In the bare
+# pattern, group 1 is set (to "") when the match is directly preceded by
+# "Article"/"Sentence" within the same 15-character window that
+# create_internal_refs checks in Python; such matches are skipped.
+apoc_article_ref_pattern = r"(?U)\b[Aa]rticle\s+(\d+(?:\.\d+){2,})\."
+apoc_sentence_ref_pattern = r"(?U)\b[Ss]entences?\s+(\d+(?:\.\d+){2,})\.\((\d+)\)"
+apoc_bare_sentence_ref_pattern = (
+    r"(?U)((?<=[Aa]rticle\s{1,8})|(?<=[Ss]entence\s{1,7})|(?<=[Ss]entences\s{1,6}))?"
+    r"\b(\d+(?:\.\d+){2,})\.\((\d+)\)"
+)
+
+# ==========================
+# CYPHER (BATCHED WRITES)
+# ==========================
+
+def in_transactions(body):
+    """
+    Wrap a per-row query body (row bound as `row`) to run over $rows in one
+    auto-commit query; the server commits every BATCH_SIZE rows, so the
+    client never holds one large transaction open.
+    """
+    return (
+        "UNWIND $rows AS row CALL { WITH row " + body + " } "
+        f"IN TRANSACTIONS OF {BATCH_SIZE} ROWS"
+    )
+
+
+MERGE_DIVISIONS_Q = in_transactions("""
+MERGE (d:Division {codeId: row.codeId})
+SET d.division = row.division,
+    d.title = coalesce(d.title, row.title)
+WITH d, row
+MATCH (c:Code {codeId: row.rootCodeId})
+MERGE (c)-[:HAS_DIVISION]->(d)
+""")
+
+MERGE_PARTS_Q = in_transactions("""
+MERGE (p:Part {codeId: row.codeId})
+SET p.partNumber = row.partNumber,
+    p.title = coalesce(p.title, row.title)
+WITH p, row
+MATCH (d:Division {codeId: row.divisionCodeId})
+MERGE (d)-[:HAS_PART]->(p)
+""")
+
+MERGE_SECTIONS_Q = in_transactions("""
+MERGE (s:Section {codeId: row.codeId})
+SET s.sectionNumber = row.sectionNumber,
+    s.title = coalesce(s.title, row.title)
+WITH s, row
+MATCH (p:Part {codeId: row.partCodeId})
+MERGE (p)-[:HAS_SECTION]->(s)
+""")
+
+# Each row is one article with its sentences nested under row.sentences, so
+# an article and everything in it are written by a single planned statement
+MERGE_ARTICLES_Q = in_transactions("""
+MERGE (a:Article {codeId: row.codeId})
+SET a.ref = row.ref,
+    a.title = coalesce(a.title, row.title)
+FOREACH (sentence IN row.sentences |
+    MERGE (s:Sentence {codeId: sentence.codeId})
+    SET s.ref = sentence.ref,
+        s.orderInArticle = sentence.orderInArticle,
+        s.text = sentence.text
+    MERGE (a)-[:HAS_SENTENCE]->(s)
+)
+WITH a, row
+MATCH (sec:Section {codeId: row.sectionCodeId})
+MERGE (sec)-[:HAS_ARTICLE]->(a)
+""")
+
+# Targets are resolved to codeIds before writing (see resolve_refs), so both
+# endpoints are found through the codeId uniqueness constraints
+CREATE_ARTICLE_REFS_Q = in_transactions("""
+MATCH (src:Sentence {codeId: row.srcId})
+MATCH (tgt:Article {codeId: row.tgtId})
+MERGE (src)-[r:REFERS_TO {refKind: 'Article', refText: row.refText}]->(tgt)
+""")
+
+CREATE_SENTENCE_REFS_Q = in_transactions("""
+MATCH (src:Sentence {codeId: row.srcId})
+MATCH (tgt:Sentence {codeId: row.tgtId})
+MERGE (src)-[r:REFERS_TO {refKind: 'Sentence', refText: row.refText}]->(tgt)
+""")
+
+# Uniqueness constraints on the codeIds every MERGE and MATCH goes through
+CONSTRAINT_QUERIES = (
+    """
+    CREATE CONSTRAINT code_pk IF NOT EXISTS
+    FOR (c:Code)
+    REQUIRE c.codeId IS UNIQUE
+    """,
+    """
+    CREATE CONSTRAINT division_pk IF NOT EXISTS
+    FOR (d:Division)
+    REQUIRE d.codeId IS UNIQUE
+    """,
+    """
+    CREATE CONSTRAINT part_pk IF NOT EXISTS
+    FOR (p:Part)
+    REQUIRE p.codeId IS UNIQUE
+    """,
+    """
+    CREATE CONSTRAINT section_pk IF NOT EXISTS
+    FOR (s:Section)
+    REQUIRE s.codeId IS UNIQUE
+    """,
+    """
+    CREATE CONSTRAINT article_pk IF NOT EXISTS
+    FOR (a:Article)
+    REQUIRE a.codeId IS UNIQUE
+    """,
+    """
+    CREATE CONSTRAINT sentence_pk IF NOT EXISTS
+    FOR (s:Sentence)
+    REQUIRE s.codeId IS UNIQUE
+    """,
+)
+
+# Helpful indexes for REFERS_TO lookup
+INDEX_QUERIES = (
+    """
+    CREATE INDEX article_ref_idx IF NOT EXISTS
+    FOR (a:Article)
+    ON (a.ref)
+    """,
+    """
+    CREATE INDEX sentence_ref_idx IF NOT EXISTS
+    FOR (s:Sentence)
+    ON (s.ref)
+    """,
 )
 
 # ==========================
 # NEO4J SETUP & HELPERS
 # ==========================
 
-def init_constraints_and_root(driver):
-    with driver.session(**SESSION_KWARGS) as session:
-        session.run("""
-        CREATE CONSTRAINT code_pk IF NOT EXISTS
-        FOR (c:Code)
-        REQUIRE c.codeId IS UNIQUE
-        """)
-        session.run("""
-        CREATE CONSTRAINT division_pk IF NOT EXISTS
-        FOR (d:Division)
-        REQUIRE d.codeId IS UNIQUE
-        """)
-        session.run("""
-        CREATE CONSTRAINT part_pk IF NOT EXISTS
-        FOR (p:Part)
-        REQUIRE p.codeId IS UNIQUE
-        """)
-        session.run("""
-        CREATE CONSTRAINT section_pk IF NOT EXISTS
-        FOR (s:Section)
-        REQUIRE s.codeId IS UNIQUE
-        """)
-        session.run("""
-        CREATE CONSTRAINT article_pk IF NOT EXISTS
-        FOR (a:Article)
-        REQUIRE a.codeId IS UNIQUE
-        """)
-        session.run("""
-        CREATE CONSTRAINT sentence_pk IF NOT EXISTS
-        FOR (s:Sentence)
-        REQUIRE s.codeId IS UNIQUE
-        """)
+def run_schema(session, queries):
+    """
+    Run schema statements in one explicit transaction, so they go out back
+    to back instead of waiting on a round trip each.
+    """
+    with session.begin_transaction() as tx:
+        for query in queries:
+            tx.run(query)
+        tx.commit()
 
-        # Helpful indexes for REFERS_TO lookup
-        session.run("""
-        CREATE INDEX article_ref_idx IF NOT EXISTS
-        FOR (a:Article)
-        ON (a.ref)
-        """)
-        session.run("""
-        CREATE INDEX sentence_ref_idx IF NOT EXISTS
-        FOR (s:Sentence)
-        ON (s.ref)
-        """)
 
-        # Code node
+def init_constraints(driver):
+    """
+    Create the codeId uniqueness constraints the load MERGEs on, and the
+    Code root node. Secondary indexes wait for init_indexes.
+    """
+    with driver.session(**SESSION_KWARGS) as session:
+        run_schema(session, CONSTRAINT_QUERIES)
+
+        # Code node (a data write, which cannot share the schema transaction)
         session.run("""
         MERGE (c:Code {codeId: $codeId})
         SET c.title = $title,
@@ -116,193 +302,460 @@ def init_constraints_and_root(driver):
            jurisdiction=CODE_JURISDICTION)
 
 
-def merge_division(tx, division_letter, title):
-    code_id = f"{CODE_ID}-{division_letter}"
-    tx.run("""
-    MERGE (d:Division {codeId: $codeId})
-    SET d.division = $division,
-        d.title = coalesce(d.title, $title)
-    WITH d
-    MATCH (c:Code {codeId: $rootCodeId})
-    MERGE (c)-[:HAS_DIVISION]->(d)
-    """, codeId=code_id,
-         division=division_letter,
-         title=title.strip(),
-         rootCodeId=CODE_ID)
-    return code_id
-
-
-def merge_part(tx, division_code_id, part_number, title):
-    code_id = f"{division_code_id}-{part_number}"
-    tx.run("""
-    MERGE (p:Part {codeId: $codeId})
-    SET p.partNumber = $partNumber,
-        p.title = coalesce(p.title, $title)
-    WITH p
-    MATCH (d:Division {codeId: $divisionCodeId})
-    MERGE (d)-[:HAS_PART]->(p)
-    """, codeId=code_id,
-         partNumber=int(part_number),
-         title=title.strip(),
-         divisionCodeId=division_code_id)
-    return code_id
-
-
-def merge_section(tx, part_code_id, section_number, title):
-    code_id = f"{part_code_id}-{section_number}"
-    tx.run("""
-    MERGE (s:Section {codeId: $codeId})
-    SET s.sectionNumber = $sectionNumber,
-        s.title = coalesce(s.title, $title)
-    WITH s
-    MATCH (p:Part {codeId: $partCodeId})
-    MERGE (p)-[:HAS_SECTION]->(s)
-    """, codeId=code_id,
-         sectionNumber=section_number,
-         title=title.strip(),
-         partCodeId=part_code_id)
-    return code_id
-
-
-def merge_article(tx, section_code_id, article_ref, title):
-    code_id = f"{section_code_id}-{article_ref}"
-    tx.run("""
-    MERGE (a:Article {codeId: $codeId})
-    SET a.ref = $ref,
-        a.title = coalesce(a.title, $title)
-    WITH a
-    MATCH (s:Section {codeId: $sectionCodeId})
-    MERGE (s)-[:HAS_ARTICLE]->(a)
-    """, codeId=code_id,
-         ref=article_ref,
-         title=title.strip(),
-         sectionCodeId=section_code_id)
-    return code_id
-
-
-def merge_sentence(tx, article_code_id, article_ref, order_in_article, text):
-    sent_code_id = f"{article_code_id}-{order_in_article}"
-    sent_ref = f"{article_ref}.({order_in_article})"
-    tx.run("""
-    MERGE (s:Sentence {codeId: $codeId})
-    SET s.ref = $ref,
-        s.orderInArticle = $orderInArticle,
-        s.text = $text
-    WITH s
-    MATCH (a:Article {codeId: $articleCodeId})
-    MERGE (a)-[:HAS_SENTENCE]->(s)
-    """, codeId=sent_code_id,
-         ref=sent_ref,
-         orderInArticle=order_in_article,
-         text=text.strip(),
-         articleCodeId=article_code_id)
-    return sent_code_id
+def init_indexes(driver):
+    """
+    Create the ref indexes used by the REFERS_TO pass and wait for them to
+    come online.
+
+    Called after the bulk load, so the load does not maintain them row by
+    row; they are populated once from the finished graph instead.
+    """
+    with driver.session(**SESSION_KWARGS) as session:
+        run_schema(session, INDEX_QUERIES)
+        session.run("CALL db.awaitIndexes()").consume()
+
+
+def write_rows(session, query, rows):
+    """Run one of the *_Q row queries over rows as a single auto-commit query"""
+    session.run(query, rows=rows).consume()
+
+
+# Parse output file per row kind, with the query that loads it, in hierarchy
+# order (divisions first, articles last) so a row's parent has always been
+# loaded by the time the row is linked to it. Sentences travel inside their
+# article's row.
+PARSE_OUTPUTS = (
+    ("division", "divisions.jsonl", MERGE_DIVISIONS_Q),
+    ("part", "parts.jsonl", MERGE_PARTS_Q),
+    ("section", "sections.jsonl", MERGE_SECTIONS_Q),
+    ("article", "articles.jsonl", MERGE_ARTICLES_Q),
+)
+
+
+def split_by_section(rows, n):
+    """
+    Deal article rows into n groups, keeping every article of a section in
+    the same group so concurrent writers never lock the same Section node.
+    """
+    groups = [[] for _ in range(n)]
+    group_of = {}
+    for row in rows:
+        group = group_of.setdefault(row["sectionCodeId"], len(group_of) % n)
+        groups[group].append(row)
+    return [group for group in groups if group]
+
+
+def write_rows_concurrently(driver, query, groups):
+    """Run query over each group of rows on its own session, in parallel"""
+    def write_group(rows):
+        with driver.session(**SESSION_KWARGS) as session:
+            write_rows(session, query, rows)
+
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        # list() re-raises the first failed group's exception
+        list(executor.map(write_group, groups))
+
+
+def load_jsonl(driver, out_dir=PARSE_OUTPUT_DIR):
+    """
+    Load the files written by write_jsonl, one query per file.
+
+    The hierarchy above articles is small and loaded in order on one
+    session. Articles, which carry nearly all the rows, are then split
+    across LOAD_WORKERS sessions writing concurrently.
+    """
+    for kind, filename, query in PARSE_OUTPUTS:
+        with open(Path(out_dir) / filename, "rb") as f:
+            rows = [orjson.loads(line) for line in f]
+        if not rows:
+            continue
+        if kind == "article":
+            write_rows_concurrently(driver, query, split_by_section(rows, LOAD_WORKERS))
+        else:
+            with driver.session(**SESSION_KWARGS) as session:
+                write_rows(session, query, rows)
 
 
 # ==========================
 # REFERS_TO HELPERS
 # ==========================
 
-def create_refers_to_article(tx, src_id, article_ref, ref_text):
-    tx.run("""
-    MATCH (src:Sentence {codeId: $srcId})
-    MATCH (tgt:Article {ref: $ref})
-    MERGE (src)-[r:REFERS_TO {refKind: 'Article', refText: $refText}]->(tgt)
-    """, srcId=src_id, ref=article_ref, refText=ref_text)
+def apoc_available(session):
+    try:
+        session.run("RETURN apoc.version()").consume()
+        return True
+    except ClientError:
+        return False
+
+
+def create_internal_refs_in_db(session):
+    """
+    Run the REFERS_TO pass inside Neo4j with apoc.periodic.iterate, so no
+    sentence text is sent to the client; each batch of BATCH_SIZE sentences
+    commits on its own.
+    """
+    article_action = """
+    UNWIND apoc.text.regexGroups(s.text, $pattern) AS g
+    MATCH (tgt:Article {ref: g[1]})
+    MERGE (s)-[r:REFERS_TO {refKind: 'Article', refText: g[0]}]->(tgt)
+    """
+    sentence_action = """
+    UNWIND apoc.text.regexGroups(s.text, $pattern) AS g
+    MATCH (tgt:Sentence {ref: g[1] + '.(' + g[2] + ')'})
+    MERGE (s)-[r:REFERS_TO {refKind: 'Sentence', refText: g[0]}]->(tgt)
+    """
+    bare_sentence_action = """
+    UNWIND apoc.text.regexGroups(s.text, $pattern) AS g
+    WITH s, g
+    WHERE g[1] IS NULL
+    MATCH (tgt:Sentence {ref: g[2] + '.(' + g[3] + ')'})
+    MERGE (s)-[r:REFERS_TO {refKind: 'Sentence', refText: g[0]}]->(tgt)
+    """
+
+    for action, pattern in (
+        (article_action, apoc_article_ref_pattern),
+        (sentence_action, apoc_sentence_ref_pattern),
+        (bare_sentence_action, apoc_bare_sentence_ref_pattern),
+    ):
+        # parallel: false, since batches MERGE relationships onto shared targets
+        record = session.run("""
+        CALL apoc.periodic.iterate(
+            'MATCH (s:Sentence) WHERE s.text IS NOT NULL RETURN s',
+            $action,
+            {batchSize: $batchSize, parallel: false, params: {pattern: $pattern}}
+        )
+        YIELD total, failedBatches, errorMessages
+        RETURN total, failedBatches, errorMessages
+        """, action=action, batchSize=BATCH_SIZE, pattern=pattern).single()
+        # apoc.periodic.iterate reports failed batches instead of raising
+        if record["failedBatches"]:
+            raise RuntimeError(
+                f"{record['failedBatches']} REFERS_TO batches failed: {record['errorMessages']}"
+            )
+
+
+@functools.lru_cache(maxsize=None)
+def ref_prefilter():
+    """Hyperscan database matching any of the three reference patterns"""
+    # Hyperscan has no lookbehind, so the bare pattern is used without the
+    # keyword check; it only selects candidates
+    patterns = (article_ref_re.pattern, sentence_ref_re.pattern, bare_sentence_ref_pattern)
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[pattern.encode() for pattern in patterns],
+        ids=list(range(len(patterns))),
+        elements=len(patterns),
+        # UTF-8 input with Unicode \s, \d and \b, as in Python's re. UCP
+        # mode rejects \b, which PREFILTER accepts by approximating it;
+        # prefiltering may report extra texts but never misses one, and
+        # find_internal_refs re-checks every hit with ref_re.
+        flags=[
+            hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_PREFILTER
+        ] * len(patterns)
+    )
+    return db
+
+
+def texts_with_refs(texts):
+    """
+    Indices of the texts that contain a reference match.
+
+    With Hyperscan the texts are joined with NUL separators, which no
+    reference can match across, scanned once, and each hit mapped back to
+    its text with a binary search. Without it every index is returned.
+    """
+    if hyperscan is None:
+        return range(len(texts))
+
+    encoded = [text.encode() for text in texts]
+    offsets = []
+    position = 0
+    for data in encoded:
+        offsets.append(position)
+        position += len(data) + 1
+
+    hits = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(bisect_right(offsets, end - 1) - 1)
+
+    ref_prefilter().scan(b"\0".join(encoded), match_event_handler=on_match)
+    return sorted(hits)
+
+
+def find_internal_refs(sentences):
+    """
+    Detect internal cross-references in sentence text.
+
+    Args:
+        sentences: (codeId, text) pairs
+
+    Returns:
+        (article_refs, sentence_refs) REFERS_TO rows of {srcId, ref, refText}
+    """
+    article_refs = []
+    sentence_refs = []
+    texts = [text or "" for _, text in sentences]
+
+    for idx in texts_with_refs(texts):
+        src_id = sentences[idx][0]
+        text = texts[idx]
 
+        for m in ref_re.finditer(text):
+            kind = m.lastgroup
+            # Article references: "Article 1.1.2.6."
+            if kind == "article":
+                article_refs.append({
+                    "srcId": src_id,
+                    "ref": m.group("article_ref"),
+                    "refText": text[m.start():m.end("article_text")]
+                })
+            # Sentence refs: "Sentence 1.1.3.1.(1)" / "Sentences 1.1.3.1.(1)"
+            elif kind == "sentence":
+                sentence_refs.append({
+                    "srcId": src_id,
+                    "ref": f"{m.group('sentence_article')}.({m.group('sentence_number')})",
+                    "refText": text[m.start():m.end("sentence_text")]
+                })
+            # Bare "1.1.3.1.(1)" – a sentence ref unless directly preceded
+            # by "Article"/"Sentence", which the branches above handle
+            elif m.group("bare_keyword") is None:
+                sentence_refs.append({
+                    "srcId": src_id,
+                    "ref": f"{m.group('bare_article')}.({m.group('bare_number')})",
+                    "refText": m.group(0)
+                })
+
+    return article_refs, sentence_refs
+
+
+def ref_lookup(records):
+    """
+    Map each ref to the codeIds of the nodes carrying it.
 
-def create_refers_to_sentence(tx, src_id, sentence_ref, ref_text):
-    tx.run("""
-    MATCH (src:Sentence {codeId: $srcId})
-    MATCH (tgt:Sentence {ref: $ref})
-    MERGE (src)-[r:REFERS_TO {refKind: 'Sentence', refText: $refText}]->(tgt)
-    """, srcId=src_id, ref=sentence_ref, refText=ref_text)
+    Args:
+        records: (ref, codeId) pairs
+
+    Returns:
+        {ref: [codeId, ...]}; a ref can name one node per division
+    """
+    lookup = {}
+    for ref, code_id in records:
+        lookup.setdefault(ref, []).append(code_id)
+    return lookup
+
+
+def resolve_refs(refs, lookup):
+    """
+    Turn {srcId, ref, refText} rows into {srcId, tgtId, refText} rows, one
+    per node the ref names; refs that name no node are dropped, as the
+    MATCH on ref would have done.
+    """
+    return [
+        {"srcId": row["srcId"], "tgtId": tgt_id, "refText": row["refText"]}
+        for row in refs
+        for tgt_id in lookup.get(row["ref"], ())
+    ]
 
 
 def create_internal_refs(driver):
     """
     Second pass: scan all Sentence.text, detect internal cross-references,
     and create REFERS_TO relationships.
+
+    Runs server-side when APOC is installed; otherwise sentence text is
+    scanned here, the refs resolved to target codeIds through lookup tables
+    fetched up front, and the relationships written once the scan is done,
+    with a commit every BATCH_SIZE rows: all Article targets in one pass,
+    then all Sentence targets.
     """
     with driver.session(**SESSION_KWARGS) as session:
-        result = session.run("""
+        if apoc_available(session):
+            create_internal_refs_in_db(session)
+            return
+
+        article_ids = ref_lookup(
+            (record["ref"], record["codeId"])
+            for record in session.run("""
+                MATCH (a:Article)
+                RETURN a.ref AS ref, a.codeId AS codeId
+            """)
+        )
+        records = list(session.run("""
             MATCH (s:Sentence)
-            RETURN s.codeId AS codeId, s.text AS text
-        """)
-
-        for record in result:
-            src_id = record["codeId"]
-            text = record["text"] or ""
-
-            # Article references: "Article 1.1.2.6."
-            for m in article_ref_re.finditer(text):
-                art_ref = m.group(1)
-                ref_text = m.group(0)
-                session.execute_write(
-                    create_refers_to_article, src_id, art_ref, ref_text
-                )
-
-            # Sentence refs: "Sentence 1.1.3.1.(1)" / "Sentences 1.1.3.1.(1)"
-            for m in sentence_ref_re.finditer(text):
-                art_ref = m.group(1)
-                sent_no = m.group(2)
-                sent_ref = f"{art_ref}.({sent_no})"
-                ref_text = m.group(0)
-                session.execute_write(
-                    create_refers_to_sentence, src_id, sent_ref, ref_text
-                )
-
-            # Bare "1.1.3.1.(1)" – treat as sentence ref if not already
-            # directly preceded by "Article"/"Sentence"
-            for m in bare_sentence_ref_re.finditer(text):
-                start = m.start()
-                prefix = text[max(0, start - 15):start]
-                if re.search(r"[Aa]rticle\s+$|[Ss]entences?\s+$", prefix):
-                    # already handled by the explicit patterns
-                    continue
-                art_ref = m.group(1)
-                sent_no = m.group(2)
-                sent_ref = f"{art_ref}.({sent_no})"
-                ref_text = m.group(0)
-                session.execute_write(
-                    create_refers_to_sentence, src_id, sent_ref, ref_text
-                )
+            RETURN s.codeId AS codeId, s.ref AS ref, s.text AS text
+        """))
+        sentence_ids = ref_lookup((record["ref"], record["codeId"]) for record in records)
+        article_refs, sentence_refs = find_internal_refs(
+            [(record["codeId"], record["text"]) for record in records]
+        )
+        # Sorted by source, each batch touches neighbouring relationship
+        # chains instead of jumping across the store
+        article_refs = sorted(resolve_refs(article_refs, article_ids), key=itemgetter("srcId", "tgtId"))
+        sentence_refs = sorted(resolve_refs(sentence_refs, sentence_ids), key=itemgetter("srcId", "tgtId"))
+
+        if article_refs:
+            write_rows(session, CREATE_ARTICLE_REFS_Q, article_refs)
+        if sentence_refs:
+            write_rows(session, CREATE_SENTENCE_REFS_Q, sentence_refs)
 
 
 # ==========================
 # PARSER (FIRST PASS)
 # ==========================
 
-def parse_pdf_and_load(driver):
+def count_pages(pdf_path):
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_page_texts(pdf_path, start, stop):
+    """
+    Yield (page_index, text) for pages [start, stop) (0-based; page_index is
+    1-based), one page at a time.
+
+    pdfplumber keeps every page's parsed character layout cached until the
+    PDF is closed; flushing each page once its text is extracted keeps
+    memory flat across the whole document.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_index, page in enumerate(pdf.pages[start:stop], start=start + 1):
+            try:
+                text = page.extract_text()
+            finally:
+                page.flush_cache()
+            yield page_index, text
+
+
+def scan_page(text):
+    """
+    Classify the non-blank lines of one page.
+
+    Runs in a worker process. Returns (kind, fields, line) per line, where
+    kind is the structure_re branch that matched (None for plain text) and
+    fields are that branch's two captured groups.
+    """
+    scanned = []
+    for raw_line in (text or "").splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        first = line[0]
+        match = (
+            structure_re.match(line)
+            if first in STRUCTURE_INITIALS or first.isdigit()
+            else None
+        )
+        if match:
+            kind = match.lastgroup
+            scanned.append((kind, match.group(*STRUCTURE_FIELDS[kind]), line))
+        else:
+            scanned.append((None, None, line))
+    return scanned
+
+
+def scan_page_range(pdf_path, start, stop):
+    """
+    Extract and classify pages [start, stop) in a worker process.
+
+    Returns (page_index, scan_page result) for each page that has text.
+    """
+    return [
+        (page_index, scan_page(text))
+        for page_index, text in iter_page_texts(pdf_path, start, stop)
+        if text
+    ]
+
+
+def parse_pdf(pdf_path):
+    """
+    Parse the PDF into node rows.
+
+    Yields (kind, row) pairs, kind being one of the PARSE_OUTPUTS kinds. An
+    article row is yielded once its last sentence has been read, with the
+    sentence rows nested under "sentences".
+    """
     current_division_code_id = None
     current_part_code_id = None
     current_section_code_id = None
     current_article_code_id = None
     current_article_ref = None
     current_sentence_order = 0
-
-    with driver.session(**SESSION_KWARGS) as session, pdfplumber.open(PDF_PATH) as pdf:
-        for page_index, page in enumerate(pdf.pages, start=1):
-            if page_index > MAX_PAGES:
-                print(f"Reached page limit ({MAX_PAGES}); stopping ingestion.")
-                break
-            text = page.extract_text()
-            if not text:
-                continue
-
-            for raw_line in text.splitlines():
-                line = raw_line.strip()
-                if not line:
+    # Row of the current article; its sentences are appended to
+    # current_article["sentences"] as they finish
+    current_article = None
+    # Row of the sentence being read and its text fragments (first line plus
+    # continuation lines); the text is joined once and the row added to its
+    # article when the next structural line starts
+    current_sentence = None
+    current_sentence_fragments = []
+    # Division, part and section codeIds already yielded; a heading repeated
+    # later (e.g. as a running page header) still resets the state below but
+    # does not send the same MERGE again
+    seen_code_ids = set()
+
+    page_count = count_pages(pdf_path)
+    total_pages = min(page_count, MAX_PAGES)
+
+    # Text extraction and line classification run in worker processes over
+    # contiguous page ranges; the state machine below consumes the results
+    # in page order.
+    workers = min(os.cpu_count() or 1, max(1, total_pages // PAGES_PER_WORKER))
+    step = max(1, -(-total_pages // workers))  # ceil division
+    starts = range(0, total_pages, step)
+    stops = [min(start + step, total_pages) for start in starts]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def finish_sentence():
+            nonlocal current_sentence
+            if current_sentence is not None:
+                current_sentence["text"] = " ".join(current_sentence_fragments)
+                current_article["sentences"].append(current_sentence)
+                current_sentence = None
+
+        def finish_article():
+            nonlocal current_article
+            finish_sentence()
+            if current_article is not None:
+                yield "article", current_article
+                current_article = None
+
+        scanned_pages = (
+            page
+            for chunk in executor.map(scan_page_range, repeat(pdf_path), starts, stops)
+            for page in chunk
+        )
+        for page_index, scanned in scanned_pages:
+            for kind, fields, line in scanned:
+                # Most lines are plain text, so they skip the structural
+                # branches below. A structural line whose parent is missing
+                # falls through those branches to the same continuation
+                # check at the end.
+                if kind is None:
+                    if current_article_code_id and current_article_ref and current_sentence_order > 0:
+                        current_sentence_fragments.append(line)
                     continue
 
                 # Division
-                div_match = division_re.match(line)
-                if div_match:
-                    division_letter = div_match.group(1)
-                    div_title = div_match.group(2) or ""
-                    current_division_code_id = session.execute_write(
-                        merge_division, division_letter, div_title
-                    )
+                if kind == "division":
+                    division_letter, div_title = fields
+                    yield from finish_article()
+                    current_division_code_id = f"{CODE_ID}-{division_letter}"
+                    if current_division_code_id not in seen_code_ids:
+                        seen_code_ids.add(current_division_code_id)
+                        yield "division", {
+                            "codeId": current_division_code_id,
+                            "division": division_letter,
+                            "title": div_title,
+                            "rootCodeId": CODE_ID
+                        }
                     current_part_code_id = None
                     current_section_code_id = None
                     current_article_code_id = None
@@ -311,13 +764,18 @@ def parse_pdf_and_load(driver):
                     continue
 
                 # Part
-                part_match = part_re.match(line)
-                if part_match and current_division_code_id:
-                    part_no = part_match.group(1)
-                    part_title = part_match.group(2) or ""
-                    current_part_code_id = session.execute_write(
-                        merge_part, current_division_code_id, part_no, part_title
-                    )
+                if kind == "part" and current_division_code_id:
+                    part_no, part_title = fields
+                    yield from finish_article()
+                    current_part_code_id = f"{current_division_code_id}-{part_no}"
+                    if current_part_code_id not in seen_code_ids:
+                        seen_code_ids.add(current_part_code_id)
+                        yield "part", {
+                            "codeId": current_part_code_id,
+                            "partNumber": int(part_no),
+                            "title": part_title,
+                            "divisionCodeId": current_division_code_id
+                        }
                     current_section_code_id = None
                     current_article_code_id = None
                     current_article_ref = None
@@ -325,68 +783,137 @@ def parse_pdf_and_load(driver):
                     continue
 
                 # Section
-                section_match = section_re.match(line)
-                if section_match and current_part_code_id:
-                    section_no = section_match.group(1)
-                    section_title = section_match.group(2) or ""
-                    current_section_code_id = session.execute_write(
-                        merge_section, current_part_code_id, section_no, section_title
-                    )
+                if kind == "section" and current_part_code_id:
+                    section_no, section_title = fields
+                    yield from finish_article()
+                    current_section_code_id = f"{current_part_code_id}-{section_no}"
+                    if current_section_code_id not in seen_code_ids:
+                        seen_code_ids.add(current_section_code_id)
+                        yield "section", {
+                            "codeId": current_section_code_id,
+                            "sectionNumber": section_no,
+                            "title": section_title,
+                            "partCodeId": current_part_code_id
+                        }
                     current_article_code_id = None
                     current_article_ref = None
                     current_sentence_order = 0
                     continue
 
                 # Article
-                article_match = article_re.match(line)
-                if article_match and current_section_code_id:
-                    article_ref = article_match.group(1)
-                    article_title = article_match.group(2) or ""
-                    current_article_code_id = session.execute_write(
-                        merge_article, current_section_code_id, article_ref, article_title
-                    )
+                if kind == "article" and current_section_code_id:
+                    article_ref, article_title = fields
+                    yield from finish_article()
+                    current_article_code_id = f"{current_section_code_id}-{article_ref}"
+                    current_article = {
+                        "codeId": current_article_code_id,
+                        "ref": article_ref,
+                        "title": article_title,
+                        "sectionCodeId": current_section_code_id,
+                        "sentences": []
+                    }
                     current_article_ref = article_ref
                     current_sentence_order = 0
                     continue
 
                 # Sentence
-                sentence_match = sentence_re.match(line)
-                if sentence_match and current_article_code_id and current_article_ref:
-                    sent_no = int(sentence_match.group(1))
-                    sent_text = sentence_match.group(2)
-                    current_sentence_order = sent_no
-                    session.execute_write(
-                        merge_sentence,
-                        current_article_code_id,
-                        current_article_ref,
-                        current_sentence_order,
-                        sent_text
-                    )
+                if kind == "sentence" and current_article_code_id and current_article_ref:
+                    sent_no, sent_text = fields
+                    finish_sentence()
+                    current_sentence_order = int(sent_no)
+                    current_sentence = {
+                        "codeId": f"{current_article_code_id}-{current_sentence_order}",
+                        "ref": f"{current_article_ref}.({current_sentence_order})",
+                        "orderInArticle": current_sentence_order
+                    }
+                    current_sentence_fragments = [sent_text]
                     continue
 
                 # Continuation of last sentence
                 if current_article_code_id and current_article_ref and current_sentence_order > 0:
-                    sent_code_id = f"{current_article_code_id}-{current_sentence_order}"
-                    session.run("""
-                    MATCH (s:Sentence {codeId: $codeId})
-                    SET s.text = s.text + ' ' + $extra
-                    """, codeId=sent_code_id, extra=line)
+                    current_sentence_fragments.append(line)
+
+            if page_index % PROGRESS_EVERY == 0:
+                print(f"Finished page {page_index}")
+
+        if page_count > MAX_PAGES:
+            print(f"Reached page limit ({MAX_PAGES}); stopping ingestion.")
+
+        yield from finish_article()
+
+
+def write_jsonl(rows, out_dir=PARSE_OUTPUT_DIR):
+    """
+    Write parse_pdf's (kind, row) pairs to one JSONL file per kind under
+    out_dir. Each file is written next to its final name and moved into
+    place once parsing has finished, so an interrupted parse leaves the
+    previous output intact.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {kind: out_dir / filename for kind, filename, _ in PARSE_OUTPUTS}
+
+    with ExitStack() as stack:
+        files = {
+            kind: stack.enter_context(open(path.with_name(path.name + ".tmp"), "wb"))
+            for kind, path in paths.items()
+        }
+        for kind, row in rows:
+            files[kind].write(orjson.dumps(row) + b"\n")
 
-            print(f"Finished page {page_index}")
+    for path in paths.values():
+        os.replace(path.with_name(path.name + ".tmp"), path)
 
 
 # ==========================
 # MAIN
 # ==========================
 
+_driver = None
+
+
+def get_driver():
+    """
+    The process-wide Neo4j driver, created on first use.
+
+    Drivers are not fork-safe: a child process must create its own (the
+    extraction workers never touch Neo4j).
+    """
+    global _driver
+    if _driver is None:
+        _driver = GraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            connection_timeout=10,
+            max_connection_pool_size=NEO4J_POOL_SIZE,
+            connection_acquisition_timeout=120,
+            max_connection_lifetime=3600,
+            keep_alive=True
+        )
+    return _driver
+
+
+def close_driver():
+    global _driver
+    if _driver is not None:
+        _driver.close()
+        _driver = None
+
+
 def main():
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD), connection_timeout=10)
+    # Parsing needs no database, so a failed load can be retried with
+    # REUSE_PARSE_OUTPUT without parsing the PDF again
+    if not REUSE_PARSE_OUTPUT:
+        write_jsonl(parse_pdf(PDF_PATH))
+
+    driver = get_driver()
     try:
-        init_constraints_and_root(driver)
-        parse_pdf_and_load(driver)
+        init_constraints(driver)
+        load_jsonl(driver)
+        init_indexes(driver)
         create_internal_refs(driver)
     finally:
-        driver.close()
+        close_driver()
 
 
 if __name__ == "__main__":
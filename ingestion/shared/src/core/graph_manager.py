@@ -12,7 +12,10 @@ class GraphManager:
             self.driver = GraphDatabase.driver(
                 NEO4J_CONFIG["uri"],
                 auth=(NEO4J_CONFIG["user"], NEO4J_CONFIG["password"]),
-                connection_timeout=10
+                connection_timeout=10,
+                max_connection_pool_size=32,
+                connection_acquisition_timeout=60,
+                keep_alive=True
             )
             logger.info("Successfully connected to Neo4j")
         except Exception as e:
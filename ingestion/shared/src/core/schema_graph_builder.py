@@ -45,38 +45,41 @@ class SchemaGraphBuilder:
             stats["nodes_created"] += 1
             logger.debug(f"Created {node['label']} node: {node['id']}")
 
-        # Step 2: Create all relationships
+        # Step 2: Create all relationships, one UNWIND per relationship type
+        rels_by_type: Dict[str, List[Dict[str, Any]]] = {}
         for rel in extracted_data.get("relationships", []):
             source_neo4j_id = self.node_id_to_neo4j_id.get(rel["source_id"])
             target_neo4j_id = self.node_id_to_neo4j_id.get(rel["target_id"])
 
             if source_neo4j_id and target_neo4j_id:
-                self._create_relationship(
-                    source_neo4j_id,
-                    rel["type"],
-                    target_neo4j_id,
-                    rel.get("properties", {})
-                )
+                rels_by_type.setdefault(rel["type"], []).append({
+                    "source_id": source_neo4j_id,
+                    "target_id": target_neo4j_id,
+                    "properties": rel.get("properties", {})
+                })
                 stats["relationships_created"] += 1
-                logger.debug(f"Created relationship: {rel['type']}")
+
+        for rel_type, rows in rels_by_type.items():
+            self._create_relationships(rel_type, rows)
+            logger.debug(f"Created {len(rows)} {rel_type} relationships")
 
         # Step 3: Link all nodes to document if provided
         if document_id:
             document_cypher = """
             MATCH (d:Document {id: $doc_id})
-            MATCH (n {neo4j_id: $node_id})
+            UNWIND $node_ids AS node_id
+            MATCH (n {neo4j_id: node_id})
             CREATE (d)-[:CONTAINS_ENTITY]->(n)
             """
-            for extraction_id, neo4j_id in self.node_id_to_neo4j_id.items():
-                try:
-                    self.graph.execute_query(document_cypher, {
-                        "doc_id": document_id,
-                        "node_id": neo4j_id
-                    })
-                except KeyError as e:
-                    logger.debug(f"Node missing expected property: {e}")
-                except Exception as e:
-                    logger.warning(f"Could not link node {neo4j_id} to document: {e}")
+            try:
+                self.graph.execute_query(document_cypher, {
+                    "doc_id": document_id,
+                    "node_ids": list(self.node_id_to_neo4j_id.values())
+                })
+            except KeyError as e:
+                logger.debug(f"Node missing expected property: {e}")
+            except Exception as e:
+                logger.warning(f"Could not link nodes to document: {e}")
 
         return stats
 
@@ -110,34 +113,24 @@ class SchemaGraphBuilder:
             return result[0].get("neo4j_id")
         return extraction_id
 
-    def _create_relationship(
-        self,
-        source_node_id: str,
-        rel_type: str,
-        target_node_id: str,
-        properties: Dict = None
-    ) -> bool:
-        """
-        Create a relationship between two nodes.
+    def _create_relationships(self, rel_type: str, rows: List[Dict[str, Any]]) -> bool:
         """
-        if properties is None:
-            properties = {}
+        Create relationships of one type in a single UNWIND query.
 
+        Each row holds source_id, target_id and properties.
+        """
         cypher = """
-        MATCH (source) WHERE id(source) = $source_id
-        MATCH (target) WHERE id(target) = $target_id
+        UNWIND $rows AS row
+        MATCH (source) WHERE id(source) = row.source_id
+        MATCH (target) WHERE id(target) = row.target_id
         CREATE (source)-[r:""" + rel_type + """]->(target)
-        SET r += $properties
-        RETURN r
+        SET r += row.properties
+        RETURN count(r) AS created
         """
 
         try:
-            result = self.graph.execute_query(cypher, {
-                "source_id": source_node_id,
-                "target_id": target_node_id,
-                "properties": properties
-            })
-            return len(result) > 0
+            result = self.graph.execute_query(cypher, {"rows": rows})
+            return bool(result) and result[0]["created"] > 0
         except Exception as e:
             logger.error(f"Error creating relationship: {e}")
             return False
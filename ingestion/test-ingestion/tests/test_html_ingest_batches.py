@@ -0,0 +1,163 @@
+"""
+Tests for the batched Neo4j writes in html_read_with_GPT/main.py and
+stage3_neo4j_html_ingestion.py.
+
+Loads the modules by path (obc-ingestion is not an importable package
+name) with a recording graph in place of Neo4j. Skipped when its
+dependencies are missing.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("dotenv")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("bs4")
+pytest.importorskip("requests")
+pytest.importorskip("openai")
+
+HTML_DIR = Path(__file__).resolve().parents[2] / "obc-ingestion" / "html_read_with_GPT"
+
+
+def load_module(name, filename):
+    sys.path.insert(0, str(HTML_DIR))
+    try:
+        spec = importlib.util.spec_from_file_location(name, HTML_DIR / filename)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(HTML_DIR))
+    return module
+
+
+@pytest.fixture(scope="module")
+def pipeline_module():
+    return load_module("html_main", "main.py")
+
+
+@pytest.fixture(scope="module")
+def stage3_module():
+    return load_module("html_stage3", "stage3_neo4j_html_ingestion.py")
+
+
+class RecordingGraph:
+    """
+    Gives every UNWIND row a fresh id; fails queries containing fail_on.
+
+    Rows whose parent_id is None are dropped, as the queries' MATCH does.
+    """
+
+    KEY_FIELDS = ("key", "div_id", "part_num", "number")
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.rows = []
+        self.next_id = 0
+
+    def execute_query(self, query, parameters=None):
+        if self.fail_on and self.fail_on in query:
+            raise RuntimeError("write failed")
+        if "UNWIND" not in query:
+            self.next_id += 1
+            return [{"part_id": "part", "neo4j_id": self.next_id}]
+        records = []
+        for row in parameters["rows"]:
+            if "row.parent_id" in query and row["parent_id"] is None:
+                continue
+            self.next_id += 1
+            self.rows.append(row)
+            key = next(row[field] for field in self.KEY_FIELDS if field in row)
+            records.append({"key": key, "neo4j_id": self.next_id})
+        return records
+
+
+class LengthEmbeddings:
+    def embed_batch(self, texts):
+        return [[float(len(text))] for text in texts]
+
+
+EXTRACTION = {
+    "sections": [
+        {
+            "section_number": "3.1",
+            "title": "General",
+            "extracted_clauses": [
+                {"number": "(1)", "text": None, "nested_items": [{"number": "(a)", "text": "x" * 1500}]},
+                {"number": "(2)", "text": "Exits shall be provided."},
+            ],
+        },
+    ],
+}
+
+
+def test_ingest_none_text(tmp_path, pipeline_module):
+    """A clause without text is written with an empty one; long texts are embedded whole and stored cut"""
+    pipeline = pipeline_module.HTMLIngestPipeline(data_dir=str(tmp_path), use_gpt=False)
+    graph = RecordingGraph()
+
+    stats = pipeline._ingest_to_neo4j(EXTRACTION, graph, LengthEmbeddings())
+
+    assert stats["success"] and stats["errors"] == []
+    assert stats["nodes_created"] == 3 + 4
+    assert stats["clauses_ingested"] == 2
+    texts = {row["number"]: (row["text"], row["embedding"]) for row in graph.rows if "embedding" in row}
+    assert texts["(1)"] == ("", [0.0])
+    assert texts["(a)"] == ("x" * 1000, [1500.0])
+
+
+def test_ingest_records_failed_batch(tmp_path, pipeline_module):
+    """A failing subclause batch is recorded in stats["errors"] without dropping the clauses"""
+    pipeline = pipeline_module.HTMLIngestPipeline(data_dir=str(tmp_path), use_gpt=False)
+    graph = RecordingGraph(fail_on="HAS_SUBCLAUSE")
+
+    stats = pipeline._ingest_to_neo4j(EXTRACTION, graph, LengthEmbeddings())
+
+    assert stats["errors"] == ["write failed"]
+    assert stats["clauses_ingested"] == 2
+    assert stats["nodes_created"] == 3 + 3
+
+
+STAGE2_OUTPUT = [
+    {
+        "extracted_chunks": [
+            {
+                "content_metadata": {"section": "3.1"},
+                "extracted": {
+                    "clauses": [
+                        {"number": "(1)", "text": None, "nested_items": [{"number": "(a)", "text": "x", "type": "item"}]},
+                        {"number": "(2)", "text": "Exits shall be provided."},
+                    ],
+                    "definitions": [{"term": "exit", "definition": None}],
+                },
+            },
+        ],
+    },
+]
+
+
+def test_stage3_counts_written_rows(monkeypatch, stage3_module):
+    """Every buffered clause, item and definition is counted when all batches succeed"""
+    monkeypatch.setattr(stage3_module, "_get_embedding_manager", LengthEmbeddings)
+    ingester = stage3_module.Neo4jHTMLIngester(RecordingGraph())
+
+    stats = ingester.ingest(STAGE2_OUTPUT)
+
+    assert stats["success"] and stats["errors"] == []
+    assert (stats["clauses_created"], stats["items_created"], stats["definitions_created"]) == (2, 1, 1)
+
+
+def test_stage3_records_failed_batch(monkeypatch, stage3_module):
+    """A failing clause batch is recorded; the definitions are still written and orphaned items are not counted"""
+    monkeypatch.setattr(stage3_module, "_get_embedding_manager", LengthEmbeddings)
+    ingester = stage3_module.Neo4jHTMLIngester(RecordingGraph(fail_on=":HAS_CLAUSE]"))
+
+    stats = ingester.ingest(STAGE2_OUTPUT)
+
+    assert stats["success"]
+    assert stats["errors"] == ["write failed"]
+    assert (stats["clauses_created"], stats["items_created"], stats["definitions_created"]) == (0, 0, 1)
+    assert stats["nodes_created"] == 2 + 2 + 1 + 1
@@ -0,0 +1,45 @@
+"""
+Tests for the page text the PDF readers extract with PDFium.
+
+Loads pdf_read_adv/obc_reader.py and pdf_read_with_GPT/stage1_extraction.py
+by path (obc-ingestion is not an importable package name) and reads
+regex_ingestion/building_code.pdf. Skipped when their dependencies or the
+PDF are missing.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+pytest.importorskip("pdfplumber")
+pytest.importorskip("orjson")
+pytest.importorskip("pypdfium2")
+
+OBC_INGESTION = Path(__file__).resolve().parents[2] / "obc-ingestion"
+PDF_PATH = OBC_INGESTION / "regex_ingestion" / "building_code.pdf"
+READER_PATHS = {
+    "obc_reader": OBC_INGESTION / "pdf_read_adv" / "obc_reader.py",
+    "stage1_extraction": OBC_INGESTION / "pdf_read_with_GPT" / "stage1_extraction.py",
+}
+
+pytestmark = pytest.mark.skipif(not PDF_PATH.exists(), reason="building_code.pdf not present")
+
+
+@pytest.fixture(scope="module", params=sorted(READER_PATHS))
+def reader(request):
+    spec = importlib.util.spec_from_file_location(request.param, READER_PATHS[request.param])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_page_text_has_no_pdfium_markers(reader):
+    """Hyphens PDFium joined across line breaks come out as plain hyphens"""
+    pages = list(reader._iter_page_range(str(PDF_PATH), 0, 12))
+    text = "".join(page["text"] for page in pages)
+
+    assert "\ufffe" not in text and "\x02" not in text
+    assert "fire-resistance" in pages[4]["text"]
+    assert "self-contained" in pages[10]["text"]
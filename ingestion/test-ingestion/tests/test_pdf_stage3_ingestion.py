@@ -0,0 +1,77 @@
+"""
+Tests for the batched writes in pdf_read_with_GPT/stage3_neo4j_ingestion.py.
+
+Loads the ingester by path (obc-ingestion is not an importable package
+name) with a fake graph in place of Neo4j. Skipped when its dependencies
+are missing.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("sentence_transformers")
+
+STAGE3_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "obc-ingestion" / "pdf_read_with_GPT" / "stage3_neo4j_ingestion.py"
+)
+
+ENRICHED = {
+    "sections": [
+        {
+            "number": "3.1",
+            "title": "General",
+            "subsections": [
+                {"number": "3.1.1", "title": "Scope", "clauses": [{"number": "(1)", "text": "Applies."}]},
+                {"number": "3.1.2", "title": "Exits", "clauses": [{"number": "(1)", "text": "Exits."}]},
+            ],
+        },
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def stage3():
+    spec = importlib.util.spec_from_file_location("pdf_stage3", STAGE3_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CountingGraph:
+    """Reports every UNWIND row as written; fails queries containing fail_on"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+
+    def execute_query(self, query, parameters=None):
+        if self.fail_on and self.fail_on in query:
+            raise RuntimeError("write failed")
+        if "RETURN count(*) AS written" in query:
+            return [{"written": len(parameters["rows"])}]
+        return []
+
+
+def test_ingest_counts_written_rows(monkeypatch, stage3):
+    """Section, subsection and clause counts come from the rows each batch reports written"""
+    monkeypatch.setattr(stage3, "EmbeddingManager", lambda: None)
+
+    stats = stage3.Neo4jOBCIngester(CountingGraph()).ingest(ENRICHED)
+
+    assert stats["success"] and stats["errors"] == []
+    # Document, regulation, 2 divisions and 3 parts, then 1 + 2 + 2 rows
+    assert stats["nodes_created"] == 7 + 5
+
+
+def test_ingest_records_failed_batch(monkeypatch, stage3):
+    """A failing clause batch is recorded; the sections and subsections before it still count"""
+    monkeypatch.setattr(stage3, "EmbeddingManager", lambda: None)
+
+    stats = stage3.Neo4jOBCIngester(CountingGraph(fail_on=":HAS_CLAUSE")).ingest(ENRICHED)
+
+    assert stats["success"]
+    assert len(stats["errors"]) == 1 and "write failed" in stats["errors"][0]
+    assert stats["nodes_created"] == 7 + 3
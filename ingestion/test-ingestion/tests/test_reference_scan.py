@@ -0,0 +1,49 @@
+"""
+Tests for the cross-reference scan shared by the PDF readers.
+
+Loads pdf_read_adv/obc_reader.py and pdf_read_with_GPT/stage1_extraction.py
+by path (obc-ingestion is not an importable package name). Skipped when
+their dependencies are missing.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+pytest.importorskip("pdfplumber")
+pytest.importorskip("orjson")
+
+OBC_INGESTION = Path(__file__).resolve().parents[2] / "obc-ingestion"
+READER_PATHS = {
+    "obc_reader": OBC_INGESTION / "pdf_read_adv" / "obc_reader.py",
+    "stage1_extraction": OBC_INGESTION / "pdf_read_with_GPT" / "stage1_extraction.py",
+}
+
+
+@pytest.fixture(scope="module", params=sorted(READER_PATHS))
+def reader(request):
+    spec = importlib.util.spec_from_file_location(request.param, READER_PATHS[request.param])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_scan_references_nbsp(reader):
+    """A non-breaking space after the keyword still separates a reference, as PDF text often has"""
+    contents = ["No references here.", "see Clause\xa03.2.1.(1) and Table 4.1.2."]
+
+    found = [(idx, ref_type, target) for idx, ref_type, target, _, _ in reader._scan_references(contents)]
+
+    assert found == [(1, "Clause", "3.2.1.(1)"), (1, "Table", "4.1.2.")]
+
+
+def test_scan_references_offsets(reader):
+    """Match offsets are relative to the text the match came from"""
+    contents = ["Section 1.1 applies.", "Also Section 2.2"]
+
+    spans = [(idx, start, end) for idx, _, _, start, end in reader._scan_references(contents)]
+
+    assert spans == [(0, 0, 11), (1, 5, 16)]
+    assert contents[1][5:16] == "Section 2.2"
@@ -0,0 +1,41 @@
+"""
+Tests for the regex loader's page text and line classification.
+
+Loads regex_ingestion/regex_graph_generator.py by path (obc-ingestion is not
+an importable package name) and reads building_code.pdf. Skipped when its
+dependencies or the PDF are missing.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("pdfplumber")
+pytest.importorskip("orjson")
+
+REGEX_DIR = Path(__file__).resolve().parents[2] / "obc-ingestion" / "regex_ingestion"
+PDF_PATH = REGEX_DIR / "building_code.pdf"
+
+
+@pytest.fixture(scope="module")
+def generator():
+    spec = importlib.util.spec_from_file_location("regex_graph_generator", REGEX_DIR / "regex_graph_generator.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.skipif(not PDF_PATH.exists(), reason="building_code.pdf not present")
+def test_wrapped_references_are_not_articles(generator):
+    """Page text keeps pdfplumber's lines, so references wrapped in tables do not read as Article headers"""
+    articles = {
+        page_index: {fields for kind, fields, _ in generator.scan_page(text) if kind == "article"}
+        for page_index, text in generator.iter_page_texts(str(PDF_PATH), 44, 46)
+    }
+
+    assert ("9.24.1.2", "(1)") not in articles[45]
+    assert ("6.2.3", "14A.(3)") not in articles[46]
+    assert ("6.2.3.14", "(3)") not in articles[46]
+    assert ("1.3.1.2", "Applicable Editions") in articles[45]
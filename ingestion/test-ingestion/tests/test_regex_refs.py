@@ -0,0 +1,86 @@
+"""
+Tests for the regex loader's internal-reference detection.
+
+Loads regex_ingestion/regex_graph_generator.py by path (obc-ingestion is not
+an importable package name). Skipped when its dependencies are missing.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("pdfplumber")
+pytest.importorskip("orjson")
+
+GENERATOR_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "obc-ingestion" / "regex_ingestion" / "regex_graph_generator.py"
+)
+
+TEXTS = [
+    "See Article 3.2.1.4. for exits.",
+    "Except as permitted in Sentence 3.1.2.1.(2), walls shall be rated.",
+    "Conform to 9.10.14.5.(1) and 9.10.14.5.(2).",
+    "No reference in this sentence.",
+    "Refer to Article\xa03.2.1.4. for exits.",
+    "",
+    "Versions 1.2 and 3.4 are not references.",
+]
+
+
+@pytest.fixture(scope="module")
+def generator():
+    spec = importlib.util.spec_from_file_location("regex_graph_generator", GENERATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_texts_with_refs_hyperscan(generator):
+    """The Hyperscan prefilter compiles and selects every text ref_re matches"""
+    pytest.importorskip("hyperscan")
+    assert generator.hyperscan is not None
+
+    selected = set(generator.texts_with_refs(TEXTS))
+
+    expected = {i for i, text in enumerate(TEXTS) if generator.ref_re.search(text)}
+    assert expected == {0, 1, 2, 4}
+    assert expected <= selected
+    assert 3 not in selected and 5 not in selected
+
+
+def test_find_internal_refs(generator):
+    """Article, Sentence and bare refs are all found, including after NBSP"""
+    sentences = [(f"s{i}", text) for i, text in enumerate(TEXTS)]
+
+    article_refs, sentence_refs = generator.find_internal_refs(sentences)
+
+    assert {(row["srcId"], row["ref"]) for row in article_refs} == {
+        ("s0", "3.2.1.4"), ("s4", "3.2.1.4"),
+    }
+    assert {(row["srcId"], row["ref"]) for row in sentence_refs} == {
+        ("s1", "3.1.2.1.(2)"), ("s2", "9.10.14.5.(1)"), ("s2", "9.10.14.5.(2)"),
+    }
+
+
+class IterateSession:
+    """Answers apoc.periodic.iterate with a fixed summary record"""
+
+    def __init__(self, failed_batches, error_messages):
+        self.record = {"total": 10, "failedBatches": failed_batches, "errorMessages": error_messages}
+
+    def run(self, query, **parameters):
+        return self
+
+    def single(self):
+        return self.record
+
+
+def test_create_internal_refs_in_db_raises_on_failed_batches(generator):
+    """Failed APOC batches surface as an error rather than a silent partial write"""
+    generator.create_internal_refs_in_db(IterateSession(0, {}))
+
+    with pytest.raises(RuntimeError, match="LockClient"):
+        generator.create_internal_refs_in_db(IterateSession(2, {"LockClient timed out": 2}))